@@ -0,0 +1,104 @@
+"""
+Сравнение cmeans из pr1 с skfuzzy.cluster.cmeans по числу объектов N,
+кластеров C и признаков D.
+
+Обе реализации запускаются с одной начальной матрицей принадлежности и
+фиксированным числом итераций (error=0), поэтому сравнивается время одной
+итерации и совпадение центров. Для pr1 замеряются раскладки (D, N) и (N, D)
+и режим full_output=False.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_cmeans.py
+    python benchmarks/bench_cmeans.py --n 1000 100000 --c 3 10 --d 2 20 --json cmeans.json
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "pr1"))
+
+from cmeans import cmeans  # noqa: E402
+
+try:
+    import skfuzzy as fuzz
+except ImportError:
+    fuzz = None
+
+
+def timed(func, repeat):
+    """Лучшее время из repeat запусков и результат последнего"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_case(n, c, d, m, iterations, repeat, seed=0):
+    rng = np.random.default_rng(seed)
+    data = rng.random((d, n))           # (признаки, объекты), как в skfuzzy
+    data_rows = np.ascontiguousarray(data.T)  # (объекты, признаки)
+    init = rng.random((c, n))
+    init /= init.sum(axis=0)
+
+    paths = {
+        "pr1 (D, N)": lambda: cmeans(data, c, m, 0, iterations, init=init),
+        "pr1 (N, D)": lambda: cmeans(data_rows, c, m, 0, iterations, init=init, axis=0),
+        "pr1 centers+u": lambda: cmeans(data, c, m, 0, iterations, init=init, full_output=False),
+    }
+    if fuzz is not None:
+        paths["skfuzzy"] = lambda: fuzz.cluster.cmeans(data, c, m, 0, iterations, init=init)
+
+    rows = []
+    reference = None
+    for name, func in paths.items():
+        seconds, result = timed(func, repeat)
+        centers = result[0]
+        if reference is None:
+            reference = centers
+        rows.append({"n": n, "c": c, "d": d, "path": name,
+                     "ms_per_iteration": seconds / iterations * 1e3,
+                     "max_center_diff": float(np.max(np.abs(centers - reference)))})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="cmeans pr1 против skfuzzy.cluster.cmeans")
+    parser.add_argument("--n", type=int, nargs="+", default=[1000, 10000, 100000], help="число объектов")
+    parser.add_argument("--c", type=int, nargs="+", default=[3, 8], help="число кластеров")
+    parser.add_argument("--d", type=int, nargs="+", default=[2, 5, 20], help="число признаков")
+    parser.add_argument("--m", type=float, default=2.0, help="экспоненциальный вес")
+    parser.add_argument("--iterations", type=int, default=20, help="итераций в одном запуске")
+    parser.add_argument("--repeat", type=int, default=3, help="запусков, берётся лучший")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    if fuzz is None:
+        print("skfuzzy не установлен: замеряется только pr1")
+
+    results = []
+    print(f"  {'N':>7s} {'C':>3s} {'D':>3s}  {'вариант':16s} {'мс/итерация':>12s} {'ускорение':>10s} {'разница центров':>16s}")
+    for n, c, d in itertools.product(args.n, args.c, args.d):
+        rows = run_case(n, c, d, args.m, args.iterations, args.repeat)
+        baseline = next((r["ms_per_iteration"] for r in rows if r["path"] == "skfuzzy"), None)
+        for row in rows:
+            speedup = baseline / row["ms_per_iteration"] if baseline else float("nan")
+            row["speedup_vs_skfuzzy"] = speedup
+            print(f"  {n:7d} {c:3d} {d:3d}  {row['path']:16s} {row['ms_per_iteration']:12.3f} "
+                  f"{speedup:10.2f} {row['max_center_diff']:16.2e}")
+        results.extend(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Точность и время дефаззификации FuzzyLogic (course): точный путь без сетки
+против дискретизации агрегированного множества на сетках разного размера.
+
+Для треугольных и трапециевидных термов эталон — FuzzyLogic.defuzzify_exact,
+для gaussian и gbell — сетка из REFERENCE_RESOLUTION точек.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_defuzz.py
+    python benchmarks/bench_defuzz.py --values 500 --json defuzz.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "course"))
+
+import core as course  # noqa: E402
+
+RESOLUTIONS = [13, 121, 1201, 12001, 120001]
+REFERENCE_RESOLUTION = 1200001
+
+
+def grid_defuzzify(fuzzy, value, fuzz_method, defuzz_method, implication, resolution):
+    """Дефаззификация агрегированного множества, дискретизированного на равномерной сетке"""
+    x = np.linspace(fuzzy.hours[0], fuzzy.hours[-1], resolution)
+    weights = fuzzy.memberships(value, fuzz_method)[:, 0]
+    y = fuzzy._term_values(x, fuzz_method, weights, implication).max(axis=0)
+    return float(course.defuzzify_polyline(x, y, defuzz_method)[0])
+
+
+def timed(func, values):
+    """Результаты func для каждого значения и среднее время на одно значение, мкс"""
+    start = time.perf_counter()
+    results = np.array([func(v) for v in values])
+    return results, (time.perf_counter() - start) / len(values) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Точность и время дефаззификации")
+    parser.add_argument("--values", type=int, default=200, help="количество входных значений часов")
+    parser.add_argument("--implication", choices=["product", "min"], default="product")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    fuzzy = course.FuzzyLogic()
+    values = np.random.default_rng(0).uniform(0, 12, args.values)
+    results = []
+
+    for fuzz_method in ["triangular", "trapezoidal", "gaussian", "gbell"]:
+        for defuzz_method in ["centroid", "bisector"]:
+            if fuzz_method in ("triangular", "trapezoidal"):
+                reference, exact_time = timed(
+                    lambda v: fuzzy.defuzzify_exact(v, fuzz_method, defuzz_method, args.implication), values)
+                rows = [("exact", exact_time, 0.0)]
+            else:
+                reference, _ = timed(
+                    lambda v: grid_defuzzify(fuzzy, v, fuzz_method, defuzz_method, args.implication,
+                                             REFERENCE_RESOLUTION), values[:20])
+                reference = np.concatenate([reference, [np.nan] * (len(values) - 20)])
+                rows = []
+
+            for resolution in RESOLUTIONS:
+                estimate, elapsed = timed(
+                    lambda v: grid_defuzzify(fuzzy, v, fuzz_method, defuzz_method, args.implication,
+                                             resolution), values)
+                rows.append((f"grid {resolution}", elapsed, float(np.nanmax(np.abs(estimate - reference)))))
+
+            print(f"\n{fuzz_method} / {defuzz_method}")
+            print(f"  {'метод':14s} {'мкс/значение':>14s} {'макс. ошибка':>14s}")
+            for name, elapsed, error in rows:
+                print(f"  {name:14s} {elapsed:14.1f} {error:14.2e}")
+                results.append({"fuzz_method": fuzz_method, "defuzz_method": defuzz_method,
+                                "path": name, "us_per_value": elapsed, "max_error": error})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Проверка эквивалентности и замер скорости экспертных систем lr4 (прямые правила)
+и lr5 (прямая цепочка).
+
+Перебирает все сочетания граничных значений факторов (или случайную выборку),
+выводит анкеты, на которых рекомендации двух систем расходятся, и измеряет
+число анкет в секунду для каждого варианта вывода.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_expert.py
+    python benchmarks/bench_expert.py --samples 200000 --json results.json
+    python benchmarks/bench_expert.py --compare results.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import lr4  # noqa: E402
+from lr5 import lr5  # noqa: E402
+
+# Граничные значения числовых факторов: пороги lr4 (1 < 7, 2 < 5, 3 < 2 и < 3, 6 > 3)
+# и lr5 (те же, кроме 3 < 3), по значению с каждой стороны порога
+DOMAINS = {
+    1: [0, 6, 7, 30],
+    2: [1, 4, 5, 10],
+    3: [0, 1, 2, 3, 8],
+    4: ["да", "нет"],
+    5: ["высокая", "средняя", "низкая"],
+    6: [0, 3, 4, 10],
+    7: ["высокая", "средняя", "низкая"],
+    8: [5],  # не используется ни одним правилом
+    9: ["да", "нет"],
+    10: ["загруженный", "свободный"],
+    11: ["да", "нет"],
+}
+
+# Диапазоны для случайной выборки
+RANDOM_RANGES = {1: (0, 60), 2: (1, 10), 3: (0, 12), 6: (0, 12), 8: (1, 10)}
+
+
+def exhaustive_records():
+    """Все сочетания граничных значений факторов"""
+    factors = sorted(DOMAINS)
+    for values in itertools.product(*(DOMAINS[f] for f in factors)):
+        yield dict(zip(factors, values))
+
+
+def random_records(n, seed=0):
+    """Случайные анкеты из допустимых диапазонов"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        record = {}
+        for factor in DOMAINS:
+            if factor in RANDOM_RANGES:
+                record[factor] = rng.randint(*RANDOM_RANGES[factor])
+            else:
+                record[factor] = rng.choice(DOMAINS[factor])
+        yield record
+
+
+def lr5_forward(record):
+    return lr5.get_recommendations(lr5.apply_rules({f"factor_{k}": v for k, v in record.items()}))
+
+
+def lr5_passes(record):
+    return lr5.get_recommendations(lr5.apply_rules_passes({f"factor_{k}": v for k, v in record.items()}))
+
+
+def compare(records, limit=10):
+    """
+    Сравнивает lr4 и lr5. Возвращает число анкет с расхождением, счётчик
+    рекомендаций, выданных только одной из систем, и первые limit примеров.
+    """
+    disagreements = 0
+    by_recommendation = Counter()
+    examples = []
+    for record in records:
+        a = set(lr4.check_rules(record))
+        b = set(lr5_forward(record))
+        if a != b:
+            disagreements += 1
+            for text in a ^ b:
+                by_recommendation[(text, "lr4" if text in a else "lr5")] += 1
+            if len(examples) < limit:
+                examples.append({"record": record, "lr4": sorted(a), "lr5": sorted(b)})
+    return disagreements, by_recommendation, examples
+
+
+def throughput(records):
+    """Анкет в секунду для каждого варианта вывода"""
+    results = {}
+    engines = {
+        "lr4.check_rules": lr4.check_rules,
+        "lr5.apply_rules": lr5_forward,
+        "lr5.apply_rules_passes": lr5_passes,
+    }
+    for name, engine in engines.items():
+        start = time.perf_counter()
+        for record in records:
+            engine(record)
+        results[name] = len(records) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    lr5.get_recommendations_batch(lr5.records_to_columns(records))
+    results["lr5.get_recommendations_batch"] = len(records) / (time.perf_counter() - start)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Эквивалентность и скорость lr4 / lr5")
+    parser.add_argument("--samples", type=int, default=0,
+                        help="случайная выборка вместо перебора граничных значений")
+    parser.add_argument("--examples", type=int, default=10, help="сколько расхождений показать")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    parser.add_argument("--compare", help="JSON предыдущего запуска для сравнения скорости")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="допустимое падение скорости относительно --compare (доля)")
+    args = parser.parse_args(argv)
+
+    if args.samples:
+        records = list(random_records(args.samples))
+    else:
+        records = list(exhaustive_records())
+
+    total = len(records)
+    disagreements, by_recommendation, examples = compare(records, args.examples)
+    print(f"Анкет: {total}, расхождений lr4/lr5: {disagreements} ({disagreements / total:.1%})")
+    for (text, engine), count in by_recommendation.most_common():
+        print(f"  только {engine}: {text} — {count}")
+    for example in examples:
+        print(f"  {json.dumps(example, ensure_ascii=False)}")
+
+    print("\nСкорость (анкет/с):")
+    speed = throughput(records)
+    for name, value in speed.items():
+        print(f"  {name:32s} {value:12.0f}")
+
+    results = {"records": total, "disagreements": disagreements, "throughput": speed}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        slow = []
+        for name, value in speed.items():
+            old = baseline.get("throughput", {}).get(name)
+            if old and value < old * (1 - args.tolerance):
+                slow.append(name)
+                print(f"Замедление: {name} {old:.0f} -> {value:.0f} анкет/с")
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Масштабирование всех реализаций FCM и фаззификаторов в репозитории.
+
+Наборы замеров:
+- fcm — кластеризация C-средних: lr1, lr2 (их функции шагов в цикле, как в
+  fuzzy_c_means, но со счётчиком итераций и ограничением maxiter),
+  skfuzzy.cluster.cmeans (если установлен) и pr1/cmeans.py. Все запускаются
+  с одной начальной матрицей принадлежности и своим критерием остановки.
+- fuzzify — фаззификаторы: lr1.apply_fuzzifiers, тензоры принадлежности pr1
+  (compute_memberships), FuzzyLogic.infer_batch и FuzzyLogic.lookup из course.
+
+Для каждого сочетания N, C, D записываются общее время, время итерации,
+число итераций до сходимости и пиковая память (tracemalloc, отдельный запуск).
+Случаи, которым по оценке нужно больше --max-gb памяти, пропускаются.
+
+Результаты сохраняются в JSON вместе с коммитом и версиями, --compare сравнивает
+с предыдущим запуском и завершается с кодом 1 при замедлении или росте памяти
+больше --tolerance.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_fcm.py --json fcm.json
+    python benchmarks/bench_fcm.py --full --json fcm-full.json      # N = 10^3 ... 10^7
+    python benchmarks/bench_fcm.py --compare fcm.json --tolerance 0.2
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "course"))
+sys.path.insert(0, os.path.join(ROOT, "pr1"))
+
+import lr1  # noqa: E402
+import lr2  # noqa: E402
+import core  # noqa: E402
+from cmeans import cmeans  # noqa: E402
+from pr1 import compute_memberships  # noqa: E402
+
+try:
+    import skfuzzy as fuzz
+except ImportError:
+    fuzz = None
+
+QUICK_N = [1000, 10000, 100000]
+FULL_N = [1000, 10000, 100000, 1000000, 10000000]
+CHUNK = 65536  # порция входов для FuzzyLogic.infer_batch
+
+
+def make_data(n, c, d, seed=0):
+    """Точки (N, D) вокруг c случайных центров и начальная матрица принадлежности (N, C)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.random((c, d))
+    data = centers[rng.integers(0, c, n)] + rng.normal(scale=0.1, size=(n, d))
+    init = rng.random((n, c))
+    init /= init.sum(axis=1, keepdims=True)
+    return data, init
+
+
+def lr_fcm(module, data, c, m, error, maxiter, init):
+    """Цикл fuzzy_c_means из lr1/lr2 на их же функциях, со счётчиком итераций"""
+    membership_matrix = init.copy()
+    for iteration in range(1, maxiter + 1):
+        centers = module.compute_cluster_centers(membership_matrix, data, m)
+        distances = module.compute_distances(data, centers)
+        distances[distances == 0] = np.finfo(float).eps
+        new_membership_matrix = module.update_membership_matrix(distances, m)
+        if np.max(np.abs(new_membership_matrix - membership_matrix)) < error:
+            break
+        membership_matrix = new_membership_matrix
+    return iteration
+
+
+def fcm_paths(data, init, c, m, error, maxiter):
+    """Варианты FCM: название -> функция без аргументов, возвращающая число итераций"""
+    paths = {
+        "lr1.fuzzy_c_means": lambda: lr_fcm(lr1, data, c, m, error, maxiter, init),
+        "lr2.fuzzy_c_means": lambda: lr_fcm(lr2, data, c, m, error, maxiter, init),
+        "pr1.cmeans": lambda: cmeans(data, c, m, error, maxiter, init=init.T, axis=0)[5],
+    }
+    if fuzz is not None:
+        # skfuzzy принимает только раскладку (признаки, объекты)
+        paths["skfuzzy.cmeans"] = lambda: fuzz.cluster.cmeans(data.T, c, m, error, maxiter, init=init.T)[5]
+    return paths
+
+
+def fuzzify_paths(data, init, c, include_course=True):
+    """
+    Варианты фаззификации: название -> функция без аргументов (1 итерация).
+    Вывод course не зависит от C и D, поэтому include_course задаётся только для одного сочетания.
+    """
+    centers = (init ** 2).T @ data / (init ** 2).sum(axis=0)[:, None]
+    distances = lr1.compute_distances(data, centers)
+    variances = lr1.compute_cluster_variances(data, init, centers)
+    hours = np.linspace(0, 12, data.shape[0])
+    fuzzy = core.FuzzyLogic()
+    if include_course:
+        fuzzy.build_table()
+
+    def infer_chunked():
+        for start in range(0, len(hours), CHUNK):
+            fuzzy.infer_batch(hours[start:start + CHUNK])
+        return 1
+
+    paths = {
+        "lr1.apply_fuzzifiers": lambda: lr1.apply_fuzzifiers(distances, variances) and 1,
+        "pr1.compute_memberships": lambda: compute_memberships(data, centers, axis=0) and 1,
+        "pr1.compute_memberships float32": lambda: compute_memberships(data, centers, axis=0,
+                                                                       dtype=np.float32) and 1,
+    }
+    if include_course:
+        paths["course.FuzzyLogic.infer_batch"] = infer_chunked
+        paths["course.FuzzyLogic.lookup"] = lambda: fuzzy.lookup(hours) is not None and 1
+    return paths
+
+
+def estimate_bytes(suite, path, n, c, d):
+    """Грубая оценка пиковой памяти случая, байт"""
+    if suite == "fcm":
+        return 8 * n * (2 * d + 6 * c)
+    if path.startswith("pr1.compute_memberships"):
+        size = 4 if path.endswith("float32") else 8
+        return size * n * d * c * 6  # четыре тензора и временные массивы порции
+    if path == "course.FuzzyLogic.infer_batch":
+        return 8 * min(n, CHUNK) * 121 * 5  # термы x порция x сетка и агрегированное множество
+    if path == "course.FuzzyLogic.lookup":
+        return 8 * n * 4
+    return 8 * n * c * 12
+
+
+def run(func):
+    """Время выполнения и результат func"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def peak_memory(func):
+    """Пиковый объём памяти, выделенной во время func, МБ"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def measure(suite, paths, n, c, d, repeat, max_bytes, memory=True):
+    rows = []
+    for path, func in paths.items():
+        row = {"suite": suite, "path": path, "n": n, "c": c, "d": d}
+        if estimate_bytes(suite, path, n, c, d) > max_bytes:
+            row["skipped"] = "оценка памяти больше --max-gb"
+            rows.append(row)
+            continue
+        best, iterations = min(run(func) for _ in range(repeat))
+        row.update(total_s=best, iterations=int(iterations), s_per_iteration=best / iterations)
+        if memory:
+            row["peak_mb"] = peak_memory(func)
+        rows.append(row)
+    return rows
+
+
+def environment():
+    """Описание запуска для сравнения между коммитами"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "skfuzzy": getattr(fuzz, "__version__", None),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(results, baseline, tolerance, min_time=0.01):
+    """
+    Случаи, где время итерации или пиковая память выросли больше чем на tolerance.
+    Время не сравнивается, если оба запуска короче min_time секунд (шум таймера).
+    """
+    previous = {(r["suite"], r["path"], r["n"], r["c"], r["d"]): r
+                for r in baseline.get("results", []) if "skipped" not in r}
+    regressions = []
+    for row in results:
+        old = previous.get((row["suite"], row["path"], row["n"], row["c"], row["d"]))
+        if old is None or "skipped" in row:
+            continue
+        for metric in ("s_per_iteration", "peak_mb"):
+            if metric == "s_per_iteration" and max(row["total_s"], old["total_s"]) < min_time:
+                continue
+            if metric in row and old.get(metric) and row[metric] > old[metric] * (1 + tolerance):
+                regressions.append((row, metric, old[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Масштабирование FCM и фаззификаторов")
+    parser.add_argument("--n", type=int, nargs="+", default=QUICK_N, help="число объектов")
+    parser.add_argument("--full", action="store_true", help="N от 10^3 до 10^7")
+    parser.add_argument("--c", type=int, nargs="+", default=[3, 8], help="число кластеров")
+    parser.add_argument("--d", type=int, nargs="+", default=[2, 10], help="число признаков")
+    parser.add_argument("--suite", choices=["fcm", "fuzzify", "all"], default="all")
+    parser.add_argument("--m", type=float, default=2.0, help="экспоненциальный вес")
+    parser.add_argument("--error", type=float, default=1e-4, help="точность остановки FCM")
+    parser.add_argument("--maxiter", type=int, default=100, help="максимум итераций FCM")
+    parser.add_argument("--repeat", type=int, default=3, help="запусков, берётся лучший")
+    parser.add_argument("--max-gb", type=float, default=2.0, help="пропускать случаи с большей оценкой памяти")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    parser.add_argument("--compare", help="JSON предыдущего запуска для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="допустимый рост времени итерации и памяти относительно --compare (доля)")
+    parser.add_argument("--min-time", type=float, default=0.01,
+                        help="не сравнивать время случаев короче этого, с")
+    args = parser.parse_args(argv)
+
+    sizes = FULL_N if args.full else args.n
+    max_bytes = args.max_gb * 2 ** 30
+    if fuzz is None:
+        print("skfuzzy не установлен: skfuzzy.cmeans пропускается")
+
+    results = []
+    print(f"  {'набор':8s} {'вариант':32s} {'N':>9s} {'C':>3s} {'D':>3s} {'итераций':>9s} "
+          f"{'всего, с':>10s} {'мс/итер.':>10s} {'пик, МБ':>9s}")
+    for n, c, d in itertools.product(sizes, args.c, args.d):
+        data, init = make_data(n, c, d, args.seed)
+        suites = []
+        if args.suite in ("fcm", "all"):
+            suites.append(("fcm", fcm_paths(data, init, c, args.m, args.error, args.maxiter)))
+        if args.suite in ("fuzzify", "all"):
+            include_course = c == args.c[0] and d == args.d[0]
+            suites.append(("fuzzify", fuzzify_paths(data, init, c, include_course)))
+        for suite, paths in suites:
+            for row in measure(suite, paths, n, c, d, args.repeat, max_bytes, not args.no_memory):
+                results.append(row)
+                if "skipped" in row:
+                    print(f"  {suite:8s} {row['path']:32s} {n:9d} {c:3d} {d:3d}  пропущен: {row['skipped']}")
+                    continue
+                print(f"  {suite:8s} {row['path']:32s} {n:9d} {c:3d} {d:3d} {row['iterations']:9d} "
+                      f"{row['total_s']:10.4f} {row['s_per_iteration'] * 1e3:10.3f} "
+                      f"{row.get('peak_mb', float('nan')):9.1f}")
+        del data, init
+
+    report = {"environment": environment(), "parameters": vars(args), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_time)
+        for row, metric, old in regressions:
+            print(f"Регрессия: {row['suite']} {row['path']} N={row['n']} C={row['c']} D={row['d']} "
+                  f"{metric}: {old:.4g} -> {row[metric]:.4g}")
+        if regressions:
+            sys.exit(1)
+        print(f"Регрессий нет (допуск {args.tolerance:.0%}, базовый коммит {baseline['environment'].get('commit')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Время и память импорта модулей course: ядро (core), точка входа (main)
+и окно приложения (gui).
+
+Каждый импорт выполняется в отдельном процессе интерпретатора, чтобы кэш
+уже загруженных модулей не искажал замер. Для каждого модуля выводится
+медиана времени импорта, число загруженных модулей и пиковый объём памяти
+процесса, а также загружены ли тяжёлые зависимости (интерфейс, графика, skfuzzy).
+
+Запуск из корня репозитория:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 20 --json import.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COURSE = os.path.join(ROOT, "course")
+
+MODULES = ["core", "main", "gui"]
+HEAVY = ["customtkinter", "tkinter", "matplotlib", "matplotlib.pyplot", "skfuzzy"]
+
+# Код, выполняемый в дочернем процессе: импорт модуля и замер
+PROBE = """
+import json, resource, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "modules": len(set(sys.modules) - before),
+    "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy": sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+"""
+
+
+def measure(module, repeat):
+    """Замеры импорта module в repeat отдельных процессах"""
+    runs = []
+    env = dict(os.environ, MPLBACKEND=os.environ.get("MPLBACKEND", "Agg"))
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            cwd=COURSE, env=env, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "module": module,
+        "median_ms": statistics.median(r["seconds"] for r in runs) * 1e3,
+        "min_ms": min(r["seconds"] for r in runs) * 1e3,
+        "modules": runs[-1]["modules"],
+        "maxrss_mb": statistics.median(r["maxrss_kb"] for r in runs) / 1024,
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Время импорта модулей course")
+    parser.add_argument("--repeat", type=int, default=10, help="количество запусков на модуль")
+    parser.add_argument("--modules", nargs="+", default=MODULES, help="модули для замера")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"  {'модуль':8s} {'медиана, мс':>12s} {'мин, мс':>10s} {'модулей':>8s} {'RSS, МБ':>8s}  тяжёлые зависимости")
+    for module in args.modules:
+        try:
+            row = measure(module, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"  {module:8s} не импортируется: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        results.append(row)
+        print(f"  {module:8s} {row['median_ms']:12.1f} {row['min_ms']:10.1f} {row['modules']:8d} "
+              f"{row['maxrss_mb']:8.1f}  {', '.join(row['heavy']) or '-'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
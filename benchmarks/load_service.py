@@ -0,0 +1,137 @@
+"""
+Генератор нагрузки для сервиса вывода course/service.py.
+
+Открывает --clients одновременных соединений (keep-alive), каждое отправляет
+запросы подряд, пока не будет отправлено --requests запросов всего. Виды запросов
+(/fuzzy, /forward, /backward) выбираются случайно в долях --mix. Выводит
+задержки на стороне клиента, запросов в секунду и метрики сервиса (/metrics).
+
+Запуск (сервис уже запущен):
+    python course/service.py --port 8080
+    python benchmarks/load_service.py --port 8080 --clients 64 --requests 20000
+Сервис можно запустить в этом же процессе: --spawn.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "course"))
+
+import core  # noqa: E402
+
+
+def random_request(rng, kind, hypotheses):
+    """Путь и тело случайного запроса вида kind"""
+    if kind == 'fuzzy':
+        return '/fuzzy', {
+            'hours': round(rng.uniform(0, 12), 2),
+            'fuzz_method': rng.choice(['triangular', 'trapezoidal', 'gaussian', 'gbell']),
+            'defuzz_method': rng.choice(['centroid', 'bisector', 'mom']),
+        }
+    symptoms = {k: rng.choice(v) for k, v in core.OPTIONS_FOR.items()}
+    if kind == 'forward':
+        return '/forward', {'symptoms': symptoms}
+    return '/backward', {'hypothesis': rng.choice(hypotheses), 'symptoms': symptoms}
+
+
+async def request(reader, writer, method, path, body=None):
+    """Один запрос по открытому соединению, возвращает (код, объект ответа)"""
+    data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, counter, total, kinds, weights, seed, latencies, statuses):
+    rng = random.Random(seed)
+    hypotheses = [rule['recommendation'] for rule in core.KnowledgeBase().get_rules()] + ['нет такой гипотезы']
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            counter[0] += 1
+            kind = rng.choices(kinds, weights)[0]
+            path, body = random_request(rng, kind, hypotheses)
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, 'POST', path, body)
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(args):
+    server = None
+    if args.spawn:
+        import service
+        svc = service.InferenceService(args.window, args.max_batch)
+        svc.start()
+        server = await asyncio.start_server(svc.serve_client, args.host, args.port)
+
+    kinds, weights = zip(*[(k, float(w)) for k, w in (part.split('=') for part in args.mix.split(','))])
+    counter, latencies, statuses = [0], {}, {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, counter, args.requests, kinds, weights, seed,
+                                  latencies, statuses)
+                           for seed in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+    await writer.wait_closed()
+    if server:
+        server.close()
+        await server.wait_closed()
+        await asyncio.sleep(0.05)  # обработчики соединений завершаются после EOF
+
+    done = sum(len(v) for v in latencies.values())
+    print(f"Запросов: {done} за {elapsed:.2f} с — {done / elapsed:.0f} запросов/с, коды ответов: {statuses}")
+    print(f"  {'вид':8s} {'кол-во':>8s} {'p50, мс':>9s} {'p95, мс':>9s} {'p99, мс':>9s}")
+    report = {'requests': done, 'seconds': elapsed, 'requests_per_second': done / elapsed,
+              'statuses': statuses, 'latency_ms': {}, 'service': metrics}
+    for kind, values in sorted(latencies.items()):
+        p50, p95, p99 = np.percentile(np.array(values) * 1e3, [50, 95, 99])
+        report['latency_ms'][kind] = {'p50': p50, 'p95': p95, 'p99': p99}
+        print(f"  {kind:8s} {len(values):8d} {p50:9.2f} {p95:9.2f} {p99:9.2f}")
+    print(f"Сервис: пакетов {metrics['batches']}, средний размер пакета {metrics['mean_batch_size']:.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузка на сервис вывода course")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--clients', type=int, default=32, help="одновременных соединений")
+    parser.add_argument('--requests', type=int, default=5000, help="запросов всего")
+    parser.add_argument('--mix', default='fuzzy=0.6,forward=0.3,backward=0.1', help="доли видов запросов")
+    parser.add_argument('--spawn', action='store_true', help="запустить сервис в этом же процессе")
+    parser.add_argument('--window', type=float, default=0.002, help="окно пакета для --spawn, с")
+    parser.add_argument('--max-batch', type=int, default=256, help="размер пакета для --spawn")
+    parser.add_argument('--json', help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,697 @@
+"""
+Ядро системы планирования подготовки к экзаменам: нечёткая логика (FuzzyLogic)
+и чёткая экспертная система (KnowledgeBase, InferenceEngine).
+
+Модуль зависит только от NumPy и не загружает интерфейс и графику, поэтому
+подходит для фоновых процессов и пакетной обработки. Окно приложения — в gui.py.
+"""
+import random
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+
+# Термы выходной и входной переменной в порядке строк матрицы принадлежностей
+TERMS = ('low', 'medium', 'high')
+
+# Параметры функций принадлежности: метод -> терм -> (вид функции, параметры)
+# tri: [a, b, c], trap: [a, b, c, d], gauss: [среднее, сигма], gbell: [a, b, c]
+MEMBERSHIP_PARAMS = {
+    'triangular': {
+        'low': ('tri', [0, 0, 4]),
+        'medium': ('tri', [2, 5, 8]),
+        'high': ('tri', [6, 10, 12]),
+    },
+    'trapezoidal': {
+        'low': ('trap', [0, 0, 2, 4]),
+        'medium': ('trap', [3, 5, 6, 8]),
+        'high': ('trap', [7, 9, 10, 12]),
+    },
+    'gaussian': {
+        'low': ('gauss', [2, 1]),
+        'medium': ('gauss', [5, 1.2]),
+        'high': ('gauss', [9, 1.5]),
+    },
+    'gbell': {
+        'low': ('gbell', [1.5, 2, 2]),
+        'medium': ('gbell', [2, 2, 5]),
+        'high': ('gbell', [2, 2, 9]),
+    },
+}
+
+
+def trimf(x, params):
+    """Треугольная функция принадлежности (как skfuzzy.trimf), x — массив."""
+    a, b, c = params
+    y = np.zeros_like(x)
+    if a != b:
+        mask = (a < x) & (x < b)
+        y[mask] = (x[mask] - a) / (b - a)
+    if b != c:
+        mask = (b < x) & (x < c)
+        y[mask] = (c - x[mask]) / (c - b)
+    y[x == b] = 1.0
+    return y
+
+
+def trapmf(x, params):
+    """Трапециевидная функция принадлежности (как skfuzzy.trapmf), x — массив."""
+    a, b, c, d = params
+    y = np.ones_like(x)
+    left = x <= b
+    y[left] = trimf(x[left], [a, b, b])
+    right = x >= c
+    y[right] = trimf(x[right], [c, c, d])
+    y[(x < a) | (x > d)] = 0.0
+    return y
+
+
+def gaussmf(x, params):
+    """Гауссова функция принадлежности."""
+    mean, sigma = params
+    return np.exp(-((x - mean) ** 2) / (2 * sigma ** 2))
+
+
+def gbellmf(x, params):
+    """Обобщённая колоколообразная функция принадлежности."""
+    a, b, c = params
+    return 1.0 / (1.0 + np.abs((x - c) / a) ** (2 * b))
+
+
+MEMBERSHIP_FUNCTIONS = {'tri': trimf, 'trap': trapmf, 'gauss': gaussmf, 'gbell': gbellmf}
+
+
+def defuzzify_polyline(x, y, method='centroid'):
+    """
+    Дефаззификация ломаных: узлы x (общие для всех строк) и значения y — матрица B x len(x).
+    Площадь и момент каждого отрезка считаются точно, поэтому для кусочно-линейного
+    множества, заданного своими точками излома, результат не зависит от сетки.
+    Для строк с нулевой площадью (centroid, bisector) возвращается nan.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.atleast_2d(y)
+    if method == 'mom':
+        at_max = y == y.max(axis=1, keepdims=True)
+        return (at_max * x).sum(axis=1) / at_max.sum(axis=1)
+
+    x1, dx = x[:-1], np.diff(x)
+    y1, y2 = y[:, :-1], y[:, 1:]
+    areas = 0.5 * dx * (y1 + y2)
+    total = areas.sum(axis=1)
+    empty = total == 0
+    safe_total = np.where(empty, 1.0, total)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if method == 'centroid':
+            # Момент трапеции с линейной границей: интеграл x*y(x) по отрезку
+            moments = dx * (x1 * (y1 + y2) / 2 + dx * (y1 + 2 * y2) / 6)
+            return np.where(empty, np.nan, moments.sum(axis=1) / safe_total)
+
+        # Биссектриса: отрезок, на котором накопленная площадь достигает половины
+        cumulative = np.cumsum(areas, axis=1)
+        half = total / 2
+        index = np.argmax(cumulative >= half[:, None], axis=1)
+        rows = np.arange(y.shape[0])
+        before = np.where(index > 0, cumulative[rows, index - 1], 0.0)
+        sub = half - before
+        a, b, w = y1[rows, index], y2[rows, index], dx[index]
+        slope = (b - a) / w
+        # Корень уравнения площади a*t + slope*t^2/2 = sub в устойчивой форме
+        # (для прямоугольника даёт sub / a без отдельной ветки)
+        root = np.sqrt(np.maximum(a * a + 2 * slope * sub, 0.0))
+        denominator = a + root
+        offset = 2 * sub / np.where(denominator == 0, 1.0, denominator)
+        return np.where(empty, np.nan, x1[index] + offset)
+
+
+def _crossings(x, values):
+    """
+    Точки пересечения строк values (функции, линейные между соседними узлами x)
+    внутри каждого отрезка [x[k], x[k+1]].
+    """
+    points = []
+    for i in range(values.shape[0]):
+        for j in range(i + 1, values.shape[0]):
+            d = values[i] - values[j]
+            k = np.nonzero(d[:-1] * d[1:] < 0)[0]
+            points.append(x[k] + (x[k + 1] - x[k]) * d[k] / (d[k] - d[k + 1]))
+    return np.concatenate(points) if points else np.empty(0)
+
+
+def _mean_of_maximum(x, y):
+    """
+    Среднее максимума ломаной: середина множества точек, где достигается максимум,
+    с учётом длины горизонтальных участков (плато).
+    """
+    peak = y.max()
+    at_max = np.isclose(y, peak, rtol=0, atol=1e-12)
+    plateau = at_max[:-1] & at_max[1:]
+    lengths = np.diff(x) * plateau
+    if lengths.sum() > 0:
+        return float((lengths * (x[:-1] + x[1:]) / 2).sum() / lengths.sum())
+    return float(x[at_max].mean())
+
+
+class FuzzyLogic:
+    def __init__(self, cache_size=1024, quantum=0.01):
+        self.hours = np.arange(0, 12.1, 0.1)
+        self.params = MEMBERSHIP_PARAMS
+        self._curves = {}
+        # LRU-кэш результатов infer: (квантованное значение, методы) -> результат
+        self.cache_size = cache_size
+        self.quantum = quantum
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Таблицы дефаззифицированных значений: (методы) -> (узлы, значения)
+        self._tables = {}
+
+    def _method(self, method):
+        if method == 'all':
+            return 'triangular'
+        if method not in self.params:
+            raise ValueError("Неизвестный метод фаззификации.")
+        return method
+
+    def memberships(self, values, method='triangular'):
+        """Степени принадлежности массива значений всем термам: матрица термы x N."""
+        terms = self.params[self._method(method)]
+        x = np.atleast_1d(np.asarray(values, dtype=float))
+        result = np.empty((len(TERMS), x.shape[0]))
+        for row, term in enumerate(TERMS):
+            kind, params = terms[term]
+            result[row] = MEMBERSHIP_FUNCTIONS[kind](x, params)
+        return result
+
+    def curves(self, method='triangular'):
+        """Функции принадлежности на сетке self.hours, строятся при первом обращении."""
+        method = self._method(method)
+        if method not in self._curves:
+            self._curves[method] = list(self.memberships(self.hours, method))
+        return self._curves[method]
+
+    def fuzzify_hours(self, value, method='triangular'):
+        low, medium, high = self.memberships(value, method)[:, 0]
+        return {
+            'low': low,
+            'medium': medium,
+            'high': high,
+            'funcs': self.curves(method)
+        }
+
+    def defuzzify(self, aggregated, method='centroid'):
+        if method not in ['centroid', 'bisector', 'mom']:
+            raise ValueError("Метод дефаззификации не распознан.")
+        result = defuzzify_polyline(self.hours, aggregated, method)[0]
+        if np.isnan(result):
+            raise ValueError("Площадь агрегированного множества равна нулю.")
+        return float(result)
+
+    def aggregate_batch(self, values, method='triangular'):
+        """Агрегированные выходные множества для массива входов: матрица B x len(self.hours)."""
+        return self._aggregate(self.memberships(values, method), method)
+
+    def _aggregate(self, memberships, method):
+        curves = np.asarray(self.curves(method))
+        return (memberships[:, :, None] * curves[:, None, :]).max(axis=0)
+
+    def defuzzify_batch(self, aggregated, method='centroid'):
+        """
+        Дефаззификация всех строк матрицы B x len(self.hours) сразу.
+        Множество считается кусочно-линейным между узлами сетки, как в skfuzzy.defuzz.
+        Для строк с нулевой площадью (centroid, bisector) возвращается nan.
+        """
+        if method not in ['centroid', 'bisector', 'mom']:
+            raise ValueError("Метод дефаззификации не распознан.")
+        return defuzzify_polyline(self.hours, aggregated, method)
+
+    def _term_values(self, x, method, weights, implication):
+        """Значения термов выходного множества после импликации: матрица термы x len(x)."""
+        curves = self.memberships(x, method)
+        weights = np.asarray(weights, dtype=float)[:, None]
+        if implication == 'min':
+            return np.minimum(curves, weights)
+        return curves * weights
+
+    def aggregate_exact(self, value, method='triangular', implication='product'):
+        """
+        Точная форма агрегированного множества для треугольных и трапециевидных термов:
+        узлы ломаной (вершины термов, точки отсечения и пересечения термов) и значения в них.
+        implication: 'product' — масштабирование степенью истинности (как в run_fuzzy_mode),
+        'min' — отсечение.
+        """
+        method = self._method(method)
+        if method not in ('triangular', 'trapezoidal'):
+            raise ValueError("Точная дефаззификация возможна только для кусочно-линейных термов.")
+        lo, hi = self.hours[0], self.hours[-1]
+        weights = self.memberships(value, method)[:, 0]
+
+        # Вершины термов
+        vertices = [lo, hi]
+        for term in TERMS:
+            vertices.extend(self.params[method][term][1])
+        x = np.unique(np.clip(vertices, lo, hi))
+
+        # Точки отсечения: терм пересекает уровень своей степени истинности
+        if implication == 'min':
+            curves = self.memberships(x, method)
+            levels = np.repeat(weights[:, None], x.shape[0], axis=1)
+            cuts = [_crossings(x, np.stack([c, l])) for c, l in zip(curves, levels)]
+            x = np.unique(np.concatenate([x] + cuts))
+
+        # Пересечения термов между собой — точки излома максимума
+        terms = self._term_values(x, method, weights, implication)
+        x = np.unique(np.concatenate([x, _crossings(x, terms)]))
+        return x, self._term_values(x, method, weights, implication).max(axis=0)
+
+    def defuzzify_exact(self, value, fuzz_method='triangular', defuzz_method='centroid',
+                        implication='product', resolution=1201):
+        """
+        Дефаззификация без сетки. Для треугольных и трапециевидных термов агрегированное
+        множество кусочно-линейно, и центр тяжести и биссектриса считаются по геометрии
+        его отрезков. Для gaussian и gbell множество строится на равномерной сетке
+        из resolution точек (чем больше, тем точнее).
+        """
+        if defuzz_method not in ['centroid', 'bisector', 'mom']:
+            raise ValueError("Метод дефаззификации не распознан.")
+        method = self._method(fuzz_method)
+        if method in ('triangular', 'trapezoidal'):
+            x, y = self.aggregate_exact(value, method, implication)
+            if defuzz_method == 'mom':
+                return _mean_of_maximum(x, y)
+        else:
+            x = np.linspace(self.hours[0], self.hours[-1], resolution)
+            weights = self.memberships(value, method)[:, 0]
+            y = self._term_values(x, method, weights, implication).max(axis=0)
+        return float(defuzzify_polyline(x, y, defuzz_method)[0])
+
+    def infer(self, value, fuzz_method='triangular', defuzz_method='centroid'):
+        """
+        Нечёткий вывод для одного значения часов с LRU-кэшем.
+        Значение округляется до self.quantum, вывод выполняется для округлённого значения.
+        Возвращает новый словарь: low, medium, high, aggregated (только для чтения), crisp
+        (nan, если агрегированное множество пусто). Изменение словаря не затрагивает кэш.
+        """
+        if defuzz_method not in ['centroid', 'bisector', 'mom']:
+            raise ValueError("Метод дефаззификации не распознан.")
+        key = (round(value / self.quantum), self._method(fuzz_method), defuzz_method)
+        result = self._cache.get(key)
+        if result is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return dict(result)
+
+        self.cache_misses += 1
+        memberships = self.memberships(key[0] * self.quantum, fuzz_method)
+        aggregated = self._aggregate(memberships, fuzz_method)[0]
+        aggregated.flags.writeable = False
+        low, medium, high = memberships[:, 0]
+        crisp = float(defuzzify_polyline(self.hours, aggregated, defuzz_method)[0])
+        result = {'low': low, 'medium': medium, 'high': high, 'aggregated': aggregated, 'crisp': crisp}
+        if self.cache_size:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return dict(result)
+
+    def cache_info(self):
+        """Статистика кэша infer."""
+        total = self.cache_hits + self.cache_misses
+        return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / total if total else 0.0,
+                'size': len(self._cache), 'maxsize': self.cache_size}
+
+    def cache_clear(self):
+        self._cache.clear()
+        self.cache_hits = self.cache_misses = 0
+
+    def build_table(self, fuzz_method='triangular', defuzz_method='centroid', step=0.001):
+        """
+        Таблица дефаззифицированных значений на сетке входа 0–12 с шагом step.
+        Строится одним вызовом infer_batch и используется в lookup.
+        """
+        x = np.linspace(self.hours[0], self.hours[-1], int(round((self.hours[-1] - self.hours[0]) / step)) + 1)
+        _, crisp = self.infer_batch(x, fuzz_method, defuzz_method)
+        self._tables[(self._method(fuzz_method), defuzz_method)] = (x, crisp)
+        return x, crisp
+
+    def lookup(self, values, fuzz_method='triangular', defuzz_method='centroid'):
+        """
+        Чёткие оценки по таблице build_table (строится при первом обращении):
+        линейная интерполяция между узлами, для 'mom' — ближайший узел,
+        так как среднее максимума меняется скачками. Рядом с входами, для которых
+        множество пусто (centroid, bisector), результат — nan.
+        """
+        key = (self._method(fuzz_method), defuzz_method)
+        if key not in self._tables:
+            self.build_table(fuzz_method, defuzz_method)
+        x, crisp = self._tables[key]
+        values = np.asarray(values, dtype=float)
+        if defuzz_method == 'mom':
+            step = x[1] - x[0]
+            index = np.clip(np.rint((values - x[0]) / step).astype(int), 0, len(x) - 1)
+            return crisp[index]
+        return np.interp(values, x, crisp)
+
+    def infer_batch(self, values, fuzz_method='triangular', defuzz_method='centroid'):
+        """
+        Нечёткий вывод Мамдани для массива часов: фаззификация, агрегирование
+        и дефаззификация всех входов без цикла по defuzzify.
+        Возвращает (степени принадлежности термы x B, чёткие оценки длины B).
+        """
+        memberships = self.memberships(values, fuzz_method)
+        aggregated = self._aggregate(memberships, fuzz_method)
+        return memberships, self.defuzzify_batch(aggregated, defuzz_method)
+
+
+# Словарь признаков экспертной системы: признак -> допустимые значения.
+# Порядок задаёт целочисленные коды признаков и значений в KnowledgeBase.
+OPTIONS_FOR = {
+    'уровень знаний': ['низкий', 'средний', 'высокий'],
+    'оставшееся время': ['< 1 дня', '1-3 дня', '4-7 дней', '> недели'],
+    'тип экзамена': ['тестирование', 'билеты', 'задачи'],
+    'мотивация': ['низкая', 'средняя', 'высокая'],
+    'усталость': ['нет', 'да'],
+    'концентрация': ['низкая', 'средняя', 'высокая'],
+    'качество сна': ['плохое', 'хорошее']
+}
+
+
+def normalize_text(text):
+    """Приводит текст к виду для поиска: без учёта регистра и повторяющихся пробелов."""
+    return ' '.join(text.casefold().split())
+
+
+def trigrams(text):
+    """Множество триграмм текста (с пробелами по краям, чтобы учитывать начала слов)."""
+    padded = f' {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class KnowledgeBase:
+    def __init__(self):
+        self.rules = [
+            # Исходные правила
+            {'conditions': {'уровень знаний': 'низкий', 'оставшееся время': '< 1 дня'}, 'recommendation': 'Паниковое повторение основ'},
+            {'conditions': {'уровень знаний': 'средний', 'оставшееся время': '4-7 дней', 'мотивация': 'высокая'}, 'recommendation': 'Создайте подробный план подготовки'},
+            {'conditions': {'усталость': 'да', 'концентрация': 'низкая'}, 'recommendation': 'Сделайте перерыв на 1 день, отдохните'},
+            {'conditions': {'тип экзамена': 'тестирование', 'уровень знаний': 'высокий'}, 'recommendation': 'Тренируйтесь на онлайн-тестах'},
+            {'conditions': {'оставшееся время': '> недели', 'мотивация': 'низкая'}, 'recommendation': 'Установите ежедневные цели'},
+            {'conditions': {'оставшееся время': '1-3 дня', 'качество сна': 'плохое'}, 'recommendation': 'Нормализуйте режим сна'},
+            {'conditions': {'концентрация': 'низкая', 'мотивация': 'низкая'}, 'recommendation': 'Измените среду обучения или место'},
+            {'conditions': {'уровень знаний': 'высокий', 'оставшееся время': '> недели'}, 'recommendation': 'Продолжайте систематически повторять'},
+            {'conditions': {'оставшееся время': '1-3 дня', 'усталость': 'нет'}, 'recommendation': 'Финальный интенсивный повтор'},
+            {'conditions': {'оставшееся время': '4-7 дней', 'усталость': 'нет', 'мотивация': 'высокая'}, 'recommendation': 'Работайте по 2-3 часа с перерывами'},
+            {'conditions': {'уровень знаний': 'низкий', 'мотивация': 'низкая'}, 'recommendation': 'Начните с базовых тем и простых задач'},
+            {'conditions': {'уровень знаний': 'средний', 'тип экзамена': 'билеты'}, 'recommendation': 'Подготовьте конспекты по билетам'},
+            {'conditions': {'усталость': 'да', 'качество сна': 'плохое'}, 'recommendation': 'Пересмотрите свой график сна'},
+            {'conditions': {'концентрация': 'высокая', 'оставшееся время': '> недели'}, 'recommendation': 'Создайте расписание с приоритетами'},
+            {'conditions': {'мотивация': 'высокая', 'концентрация': 'средняя'}, 'recommendation': 'Используйте таймер Помодоро'},
+            {'conditions': {'оставшееся время': '1-3 дня', 'тип экзамена': 'задачи'}, 'recommendation': 'Решайте примеры под таймер'},
+            {'conditions': {'уровень знаний': 'высокий', 'усталость': 'да'}, 'recommendation': 'Сделайте короткий отдых перед финалом'},
+            {'conditions': {'качество сна': 'плохое', 'мотивация': 'низкая'}, 'recommendation': 'Улучшите условия сна и употребляйте меньше кофе'},
+            {'conditions': {'концентрация': 'низкая', 'тип экзамена': 'тестирование'}, 'recommendation': 'Попробуйте тесты с ограничением времени'},
+            {'conditions': {'оставшееся время': '> недели', 'усталость': 'нет'}, 'recommendation': 'Постоянно тренируйтесь по одному разделу в день'},
+            {'conditions': {'уровень знаний': 'средний', 'качество сна': 'хорошее'}, 'recommendation': 'Уделяйте больше внимания слабым местам'},
+            {'conditions': {'мотивация': 'высокая', 'тип экзамена': 'билеты'}, 'recommendation': 'Запишите ответы на видео для лучшего запоминания'},
+            {'conditions': {'усталость': 'нет', 'концентрация': 'высокая'}, 'recommendation': 'Максимально используйте этот период продуктивности'},
+            {'conditions': {'оставшееся время': '4-7 дней', 'качество сна': 'плохое'}, 'recommendation': 'Восстановите силы перед решающей фазой'},
+            {'conditions': {'уровень знаний': 'низкий', 'тип экзамена': 'задачи'}, 'recommendation': 'Повторяйте формулы и типовые решения'},
+            {'conditions': {'мотивация': 'средняя', 'тип экзамена': 'тестирование'}, 'recommendation': 'Проходите тесты раз в два дня'},
+            {'conditions': {'концентрация': 'средняя', 'оставшееся время': '1-3 дня'}, 'recommendation': 'Фокусируйтесь на самых важных темах'},
+            {'conditions': {'усталость': 'да', 'тип экзамена': 'билеты'}, 'recommendation': 'Отдыхайте, но держите билеты под рукой'},
+            {'conditions': {'качество сна': 'хорошее', 'уровень знаний': 'средний'}, 'recommendation': 'Добавьте практику к теории'},
+            {'conditions': {'оставшееся время': '> недели', 'мотивация': 'средняя'}, 'recommendation': 'Постепенно увеличивайте нагрузку'},
+            {'conditions': {'уровень знаний': 'высокий', 'мотивация': 'средняя'}, 'recommendation': 'Оставайтесь в ритме без выгорания'}
+        ]
+        self.compile()
+        self.build_index()
+
+    def compile(self, options=OPTIONS_FOR):
+        """
+        Проверяет правила по словарю options и кодирует их целыми числами:
+        attribute_codes — признак -> номер, value_codes — признак -> значение -> номер,
+        conditions — матрица правила x признаки (int8), -1 — признак в правиле не используется;
+        posting_offsets, posting_rules — индекс в формате CSR: правила с условием на столбец
+        one-hot c — posting_rules[posting_offsets[c]:posting_offsets[c + 1]] (по возрастанию).
+        Неизвестный признак или значение — ValueError с номером правила.
+        """
+        self.attributes = list(options)
+        self.attribute_codes = {attr: i for i, attr in enumerate(self.attributes)}
+        self.value_codes = {attr: {value: j for j, value in enumerate(values)}
+                            for attr, values in options.items()}
+
+        conditions = np.full((len(self.rules), len(self.attributes)), -1, dtype=np.int8)
+        for i, rule in enumerate(self.rules):
+            for attr, value in rule['conditions'].items():
+                if attr not in self.attribute_codes:
+                    raise ValueError(f"Правило {i + 1}: неизвестный признак '{attr}'.")
+                if value not in self.value_codes[attr]:
+                    raise ValueError(f"Правило {i + 1}: недопустимое значение '{value}' признака '{attr}'.")
+                conditions[i, self.attribute_codes[attr]] = self.value_codes[attr][value]
+        self.conditions = conditions
+        self.condition_counts = (conditions >= 0).sum(axis=1)
+
+        # Столбцы one-hot кодирования (признак, значение): начало блока каждого признака
+        self.value_offsets = np.cumsum([0] + [len(values) for values in options.values()])[:-1]
+        self.n_features = sum(len(values) for values in options.values())
+
+        rule_ids, attrs = np.nonzero(conditions >= 0)
+        columns = self.value_offsets[attrs] + conditions[rule_ids, attrs]
+        order = np.argsort(columns, kind='stable')  # внутри столбца правила остаются по возрастанию
+        self.posting_rules = rule_ids[order].astype(np.int32)
+        self.posting_offsets = np.zeros(self.n_features + 1, dtype=np.int32)
+        np.cumsum(np.bincount(columns, minlength=self.n_features), out=self.posting_offsets[1:])
+
+    def encode(self, symptoms):
+        """Коды значений признаков в порядке self.attributes; отсутствующее или неизвестное значение — -1."""
+        return np.array([self.value_codes[attr].get(symptoms.get(attr), -1) for attr in self.attributes],
+                        dtype=np.int8)
+
+    def encode_batch(self, students):
+        """Коды признаков для списка анкет: матрица S x признаки (int8)."""
+        codes = np.full((len(students), len(self.attributes)), -1, dtype=np.int8)
+        for j, attr in enumerate(self.attributes):
+            values = self.value_codes[attr]
+            codes[:, j] = [values.get(student.get(attr), -1) for student in students]
+        return codes
+
+    def one_hot(self, codes, sparse=True):
+        """
+        One-hot матрица строки x (признак, значение) по матрице кодов (-1 не кодируется).
+        sparse=True — scipy.sparse.csr_matrix (если scipy установлен), иначе плотный массив.
+        """
+        rows, cols = np.nonzero(codes >= 0)
+        columns = self.value_offsets[cols] + codes[rows, cols]
+        shape = (codes.shape[0], self.n_features)
+        if sparse:
+            try:
+                from scipy.sparse import csr_matrix
+            except ImportError:
+                pass
+            else:
+                return csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, columns)), shape=shape)
+        matrix = np.zeros(shape, dtype=np.float32)
+        matrix[rows, columns] = 1
+        return matrix
+
+    def condition_matrix(self, sparse=True):
+        """Матрица условий (признак, значение) x правила — транспонированное one-hot кодирование правил."""
+        return self.one_hot(self.conditions, sparse).T
+
+    def build_index(self):
+        """
+        Индексы базы знаний:
+        by_recommendation — нормализованный текст рекомендации -> номера правил;
+        prefix_trie — префиксное дерево по текстам рекомендаций для автодополнения;
+        trigrams — триграмма -> тексты рекомендаций для поиска похожих.
+        """
+        self.by_recommendation = {}
+        self.display_text = {}
+        for i, rule in enumerate(self.rules):
+            key = normalize_text(rule['recommendation'])
+            self.by_recommendation.setdefault(key, []).append(i)
+            self.display_text.setdefault(key, rule['recommendation'])
+
+        self.prefix_trie = {}
+        self.trigrams = {}
+        for key in self.by_recommendation:
+            node = self.prefix_trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = key  # пустой ключ отмечает конец текста
+            for gram in trigrams(key):
+                self.trigrams.setdefault(gram, set()).add(key)
+
+    def find_rules(self, text):
+        """Номера всех правил с данной рекомендацией (без учёта регистра и лишних пробелов)."""
+        return self.by_recommendation.get(normalize_text(text), [])
+
+    def complete(self, prefix, limit=10):
+        """Рекомендации, начинающиеся с prefix."""
+        node = self.prefix_trie
+        for char in normalize_text(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        found = []
+        stack = [node]
+        while stack and len(found) < limit:
+            node = stack.pop()
+            for char, child in sorted(node.items(), reverse=True):
+                if char == '':
+                    found.append(self.display_text[child])
+                else:
+                    stack.append(child)
+        return found[:limit]
+
+    def similar(self, text, limit=5):
+        """Похожие рекомендации по доле общих триграмм (коэффициент Дайса)."""
+        grams = trigrams(normalize_text(text))
+        if not grams:
+            return []
+        shared = {}
+        for gram in grams:
+            for key in self.trigrams.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+        scored = sorted(shared.items(),
+                        key=lambda item: -2 * item[1] / (len(grams) + len(trigrams(item[0]))))
+        return [self.display_text[key] for key, _ in scored[:limit]]
+
+    def suggest(self, text, limit=5):
+        """Подсказки для поля гипотезы: сначала продолжения префикса, затем похожие."""
+        suggestions = self.complete(text, limit)
+        for candidate in self.similar(text, limit):
+            if len(suggestions) >= limit:
+                break
+            if candidate not in suggestions:
+                suggestions.append(candidate)
+        return suggestions
+
+    def get_rules(self):
+        return self.rules
+
+
+class InferenceTrace:
+    """Трассировка одного вывода: проверенные и сработавшие правила, их обоснование и время."""
+
+    def __init__(self):
+        self.evaluated = []
+        self.fired = []
+        self.derivations = {}  # рекомендация -> (номер правила, совпавшие условия)
+        self.passes = 0
+        self.seconds = 0.0
+
+    def chain(self, recommendation):
+        return self.derivations.get(recommendation)
+
+    def summary(self):
+        return {
+            'evaluated': len(self.evaluated),
+            'fired': len(self.fired),
+            'passes': self.passes,
+            'seconds': self.seconds,
+        }
+
+
+class TraceSampler:
+    """Выборочная трассировка: start() возвращает InferenceTrace с вероятностью rate, иначе None."""
+
+    def __init__(self, rate=0.01, maxlen=100, seed=None):
+        self.rate = rate
+        self.traces = deque(maxlen=maxlen)
+        self._random = random.Random(seed)
+
+    def start(self):
+        if self._random.random() >= self.rate:
+            return None
+        trace = InferenceTrace()
+        self.traces.append(trace)
+        return trace
+
+
+class InferenceEngine:
+    def __init__(self, knowledge_base):
+        self.knowledge_base = knowledge_base
+
+    def forward_chaining(self, symptoms, trace=None):
+        if trace is not None:
+            started = time.perf_counter()
+            trace.passes += 1
+        rules = self.knowledge_base.get_rules()
+
+        # Число совпавших условий считается только по спискам правил (postings)
+        # столбцов one-hot, заданных в анкете; остальные правила не просматриваются
+        kb = self.knowledge_base
+        codes = kb.encode(symptoms)
+        counts = {}
+        for column in (kb.value_offsets[codes >= 0] + codes[codes >= 0]).tolist():
+            for i in kb.posting_rules[kb.posting_offsets[column]:kb.posting_offsets[column + 1]].tolist():
+                counts[i] = counts.get(i, 0) + 1
+
+        matched_recs = []
+        for i in sorted(counts):
+            if trace is not None:
+                trace.evaluated.append(i)
+            if counts[i] >= 2:
+                rule = rules[i]
+                matched_recs.append(rule['recommendation'])
+                if trace is not None:
+                    trace.fired.append(i)
+                    trace.derivations[rule['recommendation']] = (
+                        i, {k: v for k, v in rule['conditions'].items() if symptoms.get(k) == v})
+        if trace is not None:
+            trace.seconds = time.perf_counter() - started
+        return matched_recs
+
+    def match_counts_batch(self, students, sparse=True):
+        """
+        Число совпавших условий для всех пар анкета-правило: матрица S x R,
+        произведение one-hot матрицы анкет S x (признак, значение) на матрицу условий
+        (признак, значение) x R. students — список словарей или матрица кодов encode_batch.
+        """
+        kb = self.knowledge_base
+        codes = students if isinstance(students, np.ndarray) else kb.encode_batch(students)
+        counts = kb.one_hot(codes, sparse) @ kb.condition_matrix(sparse)
+        if not isinstance(counts, np.ndarray):
+            counts = counts.toarray()
+        return counts.astype(np.int32)
+
+    def forward_chaining_batch(self, students, min_matches=2, full_match=False, sparse=True):
+        """
+        Прямой вывод для группы анкет. Правило срабатывает, если совпало не меньше
+        min_matches условий (как в forward_chaining) или, при full_match=True, все его условия.
+        Возвращает булеву матрицу S x R; рекомендации — batch_recommendations.
+        """
+        counts = self.match_counts_batch(students, sparse)
+        if full_match:
+            return counts == self.knowledge_base.condition_counts
+        return counts >= min_matches
+
+    def batch_recommendations(self, fired):
+        """Списки рекомендаций по строкам матрицы forward_chaining_batch."""
+        rules = self.knowledge_base.get_rules()
+        return [[rules[i]['recommendation'] for i in np.flatnonzero(row)] for row in fired]
+
+    def backward_chaining_all(self, hypothesis, symptoms):
+        """Проверка гипотезы по всем правилам с этой рекомендацией: список (номер, совпало, не совпало)."""
+        rules = self.knowledge_base.get_rules()
+        results = []
+        for i in self.knowledge_base.find_rules(hypothesis):
+            matched = {}
+            unmatched = {}
+            for k, v in rules[i]['conditions'].items():
+                if symptoms.get(k) == v:
+                    matched[k] = v
+                else:
+                    unmatched[k] = (v, symptoms.get(k))
+            results.append((i, matched, unmatched))
+        return results
+
+    def backward_chaining(self, hypothesis, symptoms):
+        results = self.backward_chaining_all(hypothesis, symptoms)
+        if not results:
+            return None, None
+        _, matched, unmatched = results[0]
+        return matched, unmatched
@@ -0,0 +1,306 @@
+"""
+Окно приложения: вкладки чёткой и нечёткой логики поверх ядра core.py.
+"""
+import numpy as np
+import customtkinter as ctk
+import tkinter.messagebox as messagebox
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import matplotlib.pyplot as plt
+
+from core import OPTIONS_FOR, FuzzyLogic, KnowledgeBase, InferenceEngine
+
+# Настройки шрифтов
+ctk.set_appearance_mode("dark")
+ctk.set_default_color_theme("blue")
+
+LARGE_FONT = ('Segoe UI', 14)
+TITLE_FONT = ('Segoe UI', 16, 'bold')
+BUTTON_FONT = ('Segoe UI', 14, 'bold')
+
+GRAPH_FONT = {'font.family': 'Segoe UI', 'font.size': 14}
+plt.rcParams.update(GRAPH_FONT)
+
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+
+        self.title("🎓 Планирование времени для экзаменов")
+        self.geometry("1200x800")
+        self.minsize(1000, 700)
+
+        self.fuzzy = FuzzyLogic()
+        self.kb = KnowledgeBase()
+        self.engine = InferenceEngine(self.kb)
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        tab_control = ctk.CTkTabview(self, width=1200, height=800)
+        tab_control.pack(padx=10, pady=10, expand=True, fill="both")
+
+        tab_crisp = tab_control.add("Чёткая логика")
+        tab_fuzzy = tab_control.add("Нечёткая логика")
+
+        self.build_crisp_tab(tab_crisp)
+        self.build_fuzzy_tab(tab_fuzzy)
+
+    def build_crisp_tab(self, frame):
+        frame.grid_columnconfigure(0, minsize=150)
+        frame.grid_columnconfigure(1, weight=1)
+
+        self.symptoms_vars = {
+            'уровень знаний': ctk.StringVar(value='средний'),
+            'оставшееся время': ctk.StringVar(value='4-7 дней'),
+            'тип экзамена': ctk.StringVar(value='билеты'),
+            'мотивация': ctk.StringVar(value='средняя'),
+            'усталость': ctk.StringVar(value='нет'),
+            'концентрация': ctk.StringVar(value='средняя'),
+            'качество сна': ctk.StringVar(value='хорошее')
+        }
+
+        row = 0
+        for symptom, var in self.symptoms_vars.items():
+            ctk.CTkLabel(frame, text=symptom, font=LARGE_FONT).grid(row=row, column=0, sticky='w', padx=15, pady=10)
+            combo = ctk.CTkComboBox(frame, values=OPTIONS_FOR[symptom], variable=var, width=200)
+            combo.grid(row=row, column=1, padx=15, pady=10, sticky='ew')
+            row += 1
+
+        self.chain_var = ctk.StringVar(value='1')
+        ctk.CTkLabel(frame, text="Метод вывода:", font=LARGE_FONT).grid(row=row, column=0, sticky='w', padx=15, pady=10)
+        ctk.CTkLabel(frame, text="1 - Прямой анализ\n2 - Обратный поиск", font=LARGE_FONT).grid(
+            row=row, column=1, sticky='w', padx=15, pady=5)
+        row += 1
+        ctk.CTkComboBox(frame, values=['1', '2'], variable=self.chain_var, width=200).grid(
+            row=row, column=1, padx=15, pady=5, sticky='ew')
+
+        row += 1
+        self.hypothesis_var = ctk.StringVar()
+        ctk.CTkLabel(frame, text="Гипотеза (для метода 2):", font=LARGE_FONT).grid(
+            row=row, column=0, sticky='w', padx=15, pady=10)
+        self.hypothesis_combo = ctk.CTkComboBox(frame, values=self.kb.suggest(''),
+                                                variable=self.hypothesis_var, width=200)
+        self.hypothesis_combo.grid(row=row, column=1, padx=15, pady=10, sticky='ew')
+        self.hypothesis_var.trace_add('write', self.update_hypothesis_suggestions)
+
+        row += 1
+        ctk.CTkButton(frame, text="Получить рекомендации", command=self.run_crisp_mode, font=BUTTON_FONT).grid(
+            row=row, column=0, columnspan=2, pady=20, padx=15, ipady=10, sticky='nsew')
+
+    def update_hypothesis_suggestions(self, *args):
+        """Обновляет список подсказок гипотезы по мере ввода."""
+        suggestions = self.kb.suggest(self.hypothesis_var.get(), limit=10)
+        self.hypothesis_combo.configure(values=suggestions or [''])
+
+    def build_fuzzy_tab(self, frame):
+        frame.grid_columnconfigure(0, weight=1)
+
+        self.hours_input = ctk.DoubleVar(value=6.0)
+        self.defuzz_method = ctk.StringVar(value='centroid')
+        self.fuzz_method = ctk.StringVar(value='all')
+
+        ctk.CTkLabel(frame, text="Часы в день на подготовку:", font=LARGE_FONT).pack(pady=(20, 5))
+        ctk.CTkEntry(frame, textvariable=self.hours_input, width=200).pack(pady=5)
+
+        ctk.CTkLabel(frame, text="Метод фаззификации:", font=LARGE_FONT).pack(pady=(20, 5))
+        ctk.CTkComboBox(frame, values=['all', 'triangular', 'trapezoidal', 'gaussian', 'gbell'],
+                        variable=self.fuzz_method, width=200, command=self.on_method_change).pack(pady=5)
+
+        ctk.CTkLabel(frame, text="Метод дефаззификации:", font=LARGE_FONT).pack(pady=(20, 5))
+        ctk.CTkComboBox(frame, values=['centroid', 'bisector', 'mom'],
+                        variable=self.defuzz_method, width=200, command=self.on_method_change).pack(pady=5)
+
+        ctk.CTkButton(frame, text="Рассчитать", command=self.run_fuzzy_mode, font=BUTTON_FONT).pack(
+            pady=(30, 10), ipady=10, ipadx=20)
+
+        # Интерактивный режим: ползунок часов обновляет график и оценку без диалоговых окон
+        ctk.CTkLabel(frame, text="Интерактивный режим (ползунок часов):", font=LARGE_FONT).pack(pady=(10, 5))
+        self.hours_slider = ctk.CTkSlider(frame, from_=0, to=12, number_of_steps=1200, width=400,
+                                          command=self.on_hours_slider)
+        self.hours_slider.set(6.0)
+        self.hours_slider.pack(pady=5)
+        self.live_label = ctk.CTkLabel(frame, text="", font=LARGE_FONT)
+        self.live_label.pack(pady=5)
+
+        self.fig, self.ax = plt.subplots(figsize=(8, 5), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=frame)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+
+        # Фон без изменяемых элементов сохраняется после каждой полной перерисовки
+        self._plot_method = None
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self.on_canvas_draw)
+
+    def setup_plot(self, fuzz_method):
+        """
+        Статичная часть графика: функции принадлежности, подписи, сетка.
+        Перестраивается только при смене метода фаззификации. Заливка агрегированного
+        множества, линии часов и оценки и текст с результатом — постоянные объекты
+        с animated=True, они рисуются поверх сохранённого фона (blitting).
+        """
+        hours = self.fuzzy.hours
+        funcs = self.fuzzy.curves(fuzz_method)
+
+        self.ax.clear()
+        self.ax.plot(hours, funcs[0], 'b', label='Низкий стресс')
+        self.ax.plot(hours, funcs[1], 'g', label='Средний стресс')
+        self.ax.plot(hours, funcs[2], 'r', label='Высокий стресс')
+        self.aggregated_fill, = self.ax.fill(hours[[0, -1]], [0, 0], facecolor='y', alpha=0.1, animated=True)
+        self.hours_line = self.ax.axvline(0, color='k', linestyle=':', label='Часы в день', animated=True)
+        self.crisp_line = self.ax.axvline(0, color='k', linestyle='--', label='Оценка стресса', animated=True)
+        self.info_text = self.ax.text(0.02, 0.97, '', transform=self.ax.transAxes, va='top', fontsize=12,
+                                      animated=True)
+
+        self.ax.set_xlim(hours[0], hours[-1])
+        self.ax.set_ylim(-0.05, 1.15)
+        self.ax.set_title("Степень стресса", fontsize=14)
+        self.ax.set_xlabel("Часы в день")
+        self.ax.set_ylabel("Степень принадлежности")
+        self.ax.legend(loc='upper right')
+        self.ax.grid(True)
+        self._plot_method = fuzz_method
+        self._background = None
+        self.canvas.draw()
+
+    def on_canvas_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        if self._plot_method is not None:
+            self.draw_dynamic()
+
+    def draw_dynamic(self):
+        for artist in (self.aggregated_fill, self.hours_line, self.crisp_line, self.info_text):
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    def update_plot(self, value, fuzz_method, defuzz_method):
+        """Обновляет только изменяемые объекты графика и перерисовывает их поверх фона."""
+        if fuzz_method != self._plot_method:
+            self.setup_plot(fuzz_method)
+
+        results = self.fuzzy.infer(value, fuzz_method, defuzz_method)
+        memberships = {k: results[k] for k in ['low', 'medium', 'high']}
+        max_term = max(memberships, key=memberships.get)
+        crisp_value = results['crisp']
+
+        hours = self.fuzzy.hours
+        self.aggregated_fill.set_xy(np.column_stack([
+            np.concatenate([[hours[0]], hours, [hours[-1]]]),
+            np.concatenate([[0], results['aggregated'], [0]])]))
+        self.hours_line.set_xdata([value, value])
+        self.crisp_line.set_xdata([crisp_value, crisp_value])
+        self.crisp_line.set_visible(not np.isnan(crisp_value))
+        self.info_text.set_text(f"Часы в день: {value:.2f}\n"
+                                f"Оценка стресса: {crisp_value:.2f}\n"
+                                f"Макс. уровень: {max_term} ({memberships[max_term]:.2f})")
+
+        if self._background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self.draw_dynamic()
+        return results
+
+    def on_hours_slider(self, value):
+        value = round(float(value), 2)
+        self.hours_input.set(value)
+        results = self.update_plot(value, self.fuzz_method.get(), self.defuzz_method.get())
+        levels = ", ".join(f"{k}: {results[k]:.2f}" for k in ['low', 'medium', 'high'])
+        self.live_label.configure(text=f"{levels} | оценка стресса: {results['crisp']:.2f}")
+
+    def on_method_change(self, _=None):
+        if self._plot_method is not None:
+            self.on_hours_slider(self.hours_slider.get())
+
+    def run_fuzzy_mode(self):
+        try:
+            value = float(self.hours_input.get())
+            if value < 0 or value > 12:
+                messagebox.showerror("❌ Ошибка", "Часы должны быть в диапазоне 0–12")
+                return
+        except Exception:
+            messagebox.showerror("❌ Ошибка", "Введите корректное число для часов.")
+            return
+
+        method = self.defuzz_method.get()
+        fuzz_method = self.fuzz_method.get()
+        self.hours_slider.set(value)
+        results = self.update_plot(value, fuzz_method, method)
+        memberships = {k: results[k] for k in ['low', 'medium', 'high']}
+        crisp_value = results['crisp']
+        if np.isnan(crisp_value):
+            messagebox.showerror("❌ Ошибка", "Для этого значения агрегированное множество пусто.")
+            return
+
+        stress_based_rec = {
+            'low': ['Хорошо! Добавьте немного практики.', 'Поддерживайте текущий ритм.'],
+            'medium': ['Увеличьте отдых.', 'Делайте перерывы каждые 45 минут.'],
+            'high': ['Уменьшите нагрузку.', 'Обратитесь к психологу.', 'Старайтесь спать минимум 7 часов.']
+        }
+
+        temp_diagnoses = []
+        sorted_levels = sorted(memberships.items(), key=lambda x: x[1], reverse=True)
+        for level, strength in sorted_levels:
+            if strength > 0.2:
+                for r in stress_based_rec.get(level, []):
+                    temp_diagnoses.append(f"{r} ({strength:.2f})")
+
+        max_term = max(memberships, key=memberships.get)
+        max_value = memberships[max_term]
+
+        membership_msg = "\n".join([f"{k}: {v:.2f}" for k, v in memberships.items()])
+        diagnoses_msg = "Рекомендации по стрессу:\n" + "\n".join(temp_diagnoses) if temp_diagnoses else ""
+
+        messagebox.showinfo("📊 Результат",
+                            f"Степени стресса:\n{membership_msg}\n"
+                            f"Максимальный уровень: {max_term} ({max_value:.2f})\n"
+                            f"Дефаззифицированное значение: {crisp_value:.2f} ч.\n"
+                            f"{diagnoses_msg}\n"
+                            f"Метод фаззификации: {fuzz_method}, Метод дефаззификации: {method}")
+
+    def run_crisp_mode(self):
+        symptoms = {k: v.get() for k, v in self.symptoms_vars.items()}
+        chain = self.chain_var.get()
+
+        if chain == '1':
+            recommendations = self.engine.forward_chaining(symptoms)
+            if recommendations:
+                messagebox.showinfo("🎓 Рекомендации", "Найденные рекомендации:\n" + "\n".join(recommendations))
+            else:
+                messagebox.showinfo("⚠️ Рекомендации", "Не найдено подходящих рекомендаций.")
+
+        elif chain == '2':
+            hypothesis = self.hypothesis_var.get().strip()
+            if not hypothesis:
+                messagebox.showerror("❌ Ошибка", "Введите гипотезу для метода 2.")
+                return
+            results = self.engine.backward_chaining_all(hypothesis, symptoms)
+            if not results:
+                msg = f"Гипотеза '{hypothesis}' не найдена."
+                suggestions = self.kb.similar(hypothesis, limit=3)
+                if suggestions:
+                    msg += "\nВозможно, имелось в виду:\n" + "\n".join(f"- {s}" for s in suggestions)
+                messagebox.showinfo("🔍 Результат", msg)
+                return
+
+            msg = f"Гипотеза: {hypothesis}\n"
+            for number, (_, matched, unmatched) in enumerate(results, start=1):
+                if len(results) > 1:
+                    msg += f"\nПравило {number}:\n"
+                msg += "Подтверждённые параметры:\n"
+                for k, v in matched.items():
+                    msg += f"- {k}: {v}\n"
+                if unmatched:
+                    msg += "\nНесовпадающие параметры:\n"
+                    for k, (expected, actual) in unmatched.items():
+                        msg += f"- {k}: ожидалось {expected}, указано {actual}\n"
+                else:
+                    msg += "\nВсе параметры соответствуют гипотезе.\n"
+
+            messagebox.showinfo("📊 Результат", msg)
+        else:
+            messagebox.showerror("❌ Ошибка", "Неверный метод вывода.")
+
+
+if __name__ == "__main__":
+    app = App()
+    app.mainloop()
@@ -0,0 +1,287 @@
+"""
+Локальный HTTP/JSON-сервис вывода для ядра core.py.
+
+Одновременные запросы собираются в микропакеты: пакет отправляется на вычисление,
+когда в нём набралось max_batch запросов или с момента первого запроса прошло
+window секунд. Нечёткий вывод по пакету выполняется одним вызовом
+FuzzyLogic.infer_batch, прямой вывод — одним InferenceEngine.forward_chaining_batch.
+
+Запросы (POST, тело — JSON):
+    /fuzzy     {"hours": 5.5, "fuzz_method": "triangular", "defuzz_method": "centroid"}
+    /forward   {"symptoms": {"уровень знаний": "низкий", ...}}
+    /backward  {"hypothesis": "...", "symptoms": {...}}
+GET /metrics — число запросов и пакетов, средний размер пакета, задержки, запросов/с.
+
+Запуск:
+    python service.py --port 8080 --window 0.002 --max-batch 256
+Нагрузка: python ../benchmarks/load_service.py --port 8080
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from core import FuzzyLogic, KnowledgeBase, InferenceEngine, OPTIONS_FOR
+
+FUZZ_METHODS = ['triangular', 'trapezoidal', 'gaussian', 'gbell']
+DEFUZZ_METHODS = ['centroid', 'bisector', 'mom']
+
+
+class Metrics:
+    """Счётчики сервиса и задержки последних запросов."""
+
+    def __init__(self, maxlen=10000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.latencies = deque(maxlen=maxlen)
+
+    def add_batch(self, size):
+        self.batches += 1
+        self.batched_items += size
+
+    def add_request(self, seconds, error=False):
+        self.requests += 1
+        self.errors += error
+        self.latencies.append(seconds)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        result = {
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batches,
+            'mean_batch_size': self.batched_items / self.batches if self.batches else 0.0,
+            'requests_per_second': self.requests / elapsed if elapsed else 0.0,
+        }
+        if self.latencies:
+            p50, p95, p99 = np.percentile(np.array(self.latencies) * 1e3, [50, 95, 99])
+            result.update(latency_ms_p50=p50, latency_ms_p95=p95, latency_ms_p99=p99)
+        return result
+
+
+class MicroBatcher:
+    """
+    Очередь запросов одного вида. Обработчик handler получает список запросов
+    и возвращает список ответов той же длины. Если обработчик упал на пакете,
+    запросы пакета выполняются по одному: исключение получает только тот запрос,
+    на котором оно возникло.
+    """
+
+    def __init__(self, handler, metrics, window=0.002, max_batch=256):
+        self.handler = handler
+        self.metrics = metrics
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.metrics.add_batch(len(batch))
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.handler, items)
+            except Exception:
+                # Один ошибочный запрос не должен ронять весь пакет: повторяем по одному
+                for item, future in batch:
+                    try:
+                        [result] = await loop.run_in_executor(None, self.handler, [item])
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class InferenceService:
+    """Обработчики пакетов для нечёткого вывода и экспертной системы."""
+
+    def __init__(self, window=0.002, max_batch=256):
+        self.fuzzy = FuzzyLogic()
+        self.kb = KnowledgeBase()
+        self.engine = InferenceEngine(self.kb)
+        self.metrics = Metrics()
+        self.batchers = {
+            '/fuzzy': MicroBatcher(self.fuzzy_batch, self.metrics, window, max_batch),
+            '/forward': MicroBatcher(self.forward_batch, self.metrics, window, max_batch),
+            '/backward': MicroBatcher(self.backward_batch, self.metrics, window, max_batch),
+        }
+
+    def start(self):
+        for batcher in self.batchers.values():
+            batcher.start()
+
+    def fuzzy_batch(self, items):
+        """Нечёткий вывод: запросы группируются по паре методов, каждая группа — один infer_batch."""
+        results = [None] * len(items)
+        groups = {}
+        for position, item in enumerate(items):
+            groups.setdefault((item['fuzz_method'], item['defuzz_method']), []).append(position)
+        for (fuzz_method, defuzz_method), positions in groups.items():
+            hours = [items[p]['hours'] for p in positions]
+            memberships, crisp = self.fuzzy.infer_batch(hours, fuzz_method, defuzz_method)
+            for column, p in enumerate(positions):
+                low, medium, high = memberships[:, column]
+                results[p] = {'low': low, 'medium': medium, 'high': high,
+                              'stress': None if np.isnan(crisp[column]) else crisp[column]}
+        return results
+
+    def forward_batch(self, items):
+        fired = self.engine.forward_chaining_batch([item['symptoms'] for item in items])
+        return [{'recommendations': recs} for recs in self.engine.batch_recommendations(fired)]
+
+    def backward_batch(self, items):
+        results = []
+        for item in items:
+            rules = self.engine.backward_chaining_all(item['hypothesis'], item['symptoms'])
+            results.append({
+                'found': bool(rules),
+                'rules': [{'rule': i, 'matched': matched,
+                           'unmatched': {k: {'expected': e, 'actual': a} for k, (e, a) in unmatched.items()}}
+                          for i, matched, unmatched in rules],
+                'suggestions': [] if rules else self.kb.similar(item['hypothesis'], limit=3),
+            })
+        return results
+
+    def parse(self, path, body):
+        """Проверяет тело запроса и приводит его к виду, ожидаемому обработчиком пакета."""
+        if not isinstance(body, dict):
+            raise ValueError("Тело запроса должно быть объектом JSON.")
+        if path == '/fuzzy':
+            hours = float(body['hours'])
+            if not 0 <= hours <= 12:
+                raise ValueError("Часы должны быть в диапазоне 0–12")
+            fuzz_method = body.get('fuzz_method', 'triangular')
+            defuzz_method = body.get('defuzz_method', 'centroid')
+            if fuzz_method not in FUZZ_METHODS:
+                raise ValueError("Неизвестный метод фаззификации.")
+            if defuzz_method not in DEFUZZ_METHODS:
+                raise ValueError("Метод дефаззификации не распознан.")
+            return {'hours': hours, 'fuzz_method': fuzz_method, 'defuzz_method': defuzz_method}
+
+        symptoms = body.get('symptoms', {})
+        if not isinstance(symptoms, dict):
+            raise ValueError("symptoms должен быть объектом JSON.")
+        for attr, value in symptoms.items():
+            if attr not in OPTIONS_FOR:
+                raise ValueError(f"Неизвестный признак: {attr}")
+            if not isinstance(value, str) or value not in OPTIONS_FOR[attr]:
+                raise ValueError(f"Недопустимое значение признака «{attr}»: {value!r}")
+        if path == '/backward':
+            hypothesis = body.get('hypothesis')
+            if not isinstance(hypothesis, str) or not hypothesis.strip():
+                raise ValueError("Введите гипотезу для метода 2.")
+            return {'hypothesis': hypothesis, 'symptoms': symptoms}
+        return {'symptoms': symptoms}
+
+    async def handle(self, method, path, body):
+        """Возвращает (код ответа, объект ответа)."""
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics.summary()
+        if method != 'POST' or path not in self.batchers:
+            return 404, {'error': 'Неизвестный запрос.'}
+
+        started = time.perf_counter()
+        try:
+            item = self.parse(path, json.loads(body or b'{}'))
+        except (ValueError, KeyError, TypeError) as e:
+            self.metrics.add_request(time.perf_counter() - started, error=True)
+            return 400, {'error': str(e)}
+        try:
+            result = await self.batchers[path].submit(item)
+        except Exception as e:
+            self.metrics.add_request(time.perf_counter() - started, error=True)
+            return 500, {'error': str(e)}
+        self.metrics.add_request(time.perf_counter() - started)
+        return 200, result
+
+    async def serve_client(self, reader, writer):
+        """Соединение HTTP/1.1 с keep-alive: запросы читаются по одному до закрытия."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.handle(method, path, body)
+                data = json.dumps(payload, ensure_ascii=False, default=float).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8080, window=0.002, max_batch=256):
+    service = InferenceService(window, max_batch)
+    service.start()
+    server = await asyncio.start_server(service.serve_client, host, port)
+    print(f"Сервис вывода: http://{host}:{port} (окно {window * 1e3:.1f} мс, пакет до {max_batch})")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP-сервис нечёткого вывода и экспертной системы")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--window', type=float, default=0.002, help="окно сбора пакета, с")
+    parser.add_argument('--max-batch', type=int, default=256, help="максимальный размер пакета")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.window, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Пакетный (без диалога) запуск экспертных систем lr4 и lr5 по сохранённым анкетам.
+
+Анкеты читаются потоково из CSV (столбцы factor_1 ... factor_11 или 1 ... 11)
+или JSONL (по объекту на строку), проверяются теми же правилами, что и ввод
+с клавиатуры, и обрабатываются порциями в пуле процессов. Результаты пишутся
+в выходной JSONL-файл по мере готовности, ошибки анкет собираются отдельно.
+
+Пример:
+    python expert_batch.py answers.csv results.jsonl --engine lr5 --errors errors.jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import lr4
+from lr5 import lr5
+
+ENGINES = ["lr4", "lr5", "lr5-bitset"]
+NUMERIC_FACTORS = [1, 2, 3, 6, 8]
+CATEGORICAL_FACTORS = [4, 5, 7, 9, 10, 11]
+CATEGORICAL_VALUES = ['да', 'нет', 'высокая', 'средняя', 'низкая', 'загруженный', 'свободный']
+
+
+def parse_factor(factor, raw_input):
+    """
+    Проверяет и преобразует значение фактора, при ошибке бросает ValueError.
+    Правила те же, что в validate_input lr4 и lr5; дополнительно отклоняются
+    значения JSON, которые int() принял бы с потерей: дробные числа и true/false.
+    """
+    if factor in NUMERIC_FACTORS:
+        # int() молча отбрасывает дробную часть и превращает True в 1
+        if isinstance(raw_input, bool) or not isinstance(raw_input, (int, float, str)):
+            raise ValueError("Ожидается целое число")
+        if isinstance(raw_input, float) and not raw_input.is_integer():
+            raise ValueError("Ожидается целое число")
+        value = int(raw_input)
+        if factor == 2 and not (1 <= value <= 10):
+            raise ValueError("Значение должно быть от 1 до 10")
+        return value
+    elif factor in CATEGORICAL_FACTORS:
+        value = str(raw_input).strip().lower()
+        if value not in CATEGORICAL_VALUES:
+            raise ValueError("Недопустимое значение")
+        return value
+    else:
+        raise ValueError("Неизвестный фактор")
+
+
+def parse_record(record):
+    """
+    Проверяет все одиннадцать факторов анкеты без повторных вопросов.
+    Возвращает (данные, ошибки): данные — {номер фактора: значение}, как у collect_data
+    lr4 и lr5, ошибки — {номер фактора: текст}. Одна проверка для всех движков.
+    """
+    data = {}
+    errors = {}
+    for factor in range(1, 12):
+        raw = record.get(factor, record.get(f"factor_{factor}", record.get(str(factor))))
+        if raw is None or raw == "":
+            errors[factor] = "Значение отсутствует"
+            continue
+        try:
+            data[factor] = parse_factor(factor, raw)
+        except ValueError as e:
+            errors[factor] = str(e)
+    return data, errors
+
+
+def read_records(path):
+    """
+    Потоково читает анкеты из CSV или JSONL, возвращает пары (id, анкета).
+    Для строки JSONL, которая не разбирается в объект, вместо анкеты
+    возвращается текст ошибки, чтобы одна испорченная строка не прерывала обработку.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".json")):
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, f"Строка {line_no}: некорректный JSON ({e})"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_no, f"Строка {line_no}: ожидается объект JSON"
+                    continue
+                yield record.get("id", line_no), record
+        else:
+            for row_no, row in enumerate(csv.DictReader(f), start=1):
+                yield row.get("id") or row_no, row
+
+
+def chunked(iterable, size):
+    """Разбивает поток на списки длиной не более size"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def process_chunk(engine, chunk):
+    """
+    Обрабатывает порцию анкет в рабочем процессе.
+    Возвращает список (id, рекомендации, ошибки) в исходном порядке.
+    """
+    def parse(record):
+        # Строка, не разобранная read_records, приходит как текст ошибки
+        if isinstance(record, str):
+            return {}, {"record": record}
+        return parse_record(record)
+
+    parsed = [(record_id, *parse(record)) for record_id, record in chunk]
+    results = []
+
+    if engine == "lr5-bitset":
+        valid = [data for _, data, errors in parsed if not errors]
+        if valid:
+            matrix, texts = lr5.get_recommendations_batch(lr5.records_to_columns(valid))
+            rows = iter(matrix)
+        for record_id, data, errors in parsed:
+            if errors:
+                results.append((record_id, None, errors))
+            else:
+                row = next(rows)
+                results.append((record_id, [t for t, m in zip(texts, row) if m], None))
+        return results
+
+    for record_id, data, errors in parsed:
+        if errors:
+            results.append((record_id, None, errors))
+        elif engine == "lr4":
+            results.append((record_id, lr4.check_rules(data), None))
+        else:
+            facts = {f"factor_{k}": v for k, v in data.items()}
+            results.append((record_id, lr5.get_recommendations(lr5.apply_rules(facts)), None))
+    return results
+
+
+def run_batch(input_path, output_path, engine="lr5", errors_path=None,
+              chunk_size=1000, workers=None):
+    """
+    Обрабатывает все анкеты из input_path. В обработке одновременно находится
+    не больше 2 * workers порций, поэтому память не зависит от размера файла.
+    Возвращает статистику обработки.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {"records": 0, "errors": 0}
+    start = time.perf_counter()
+
+    out = open(output_path, "w", encoding="utf-8")
+    err = open(errors_path, "w", encoding="utf-8") if errors_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            chunks = chunked(read_records(input_path), chunk_size)
+
+            def write(results):
+                for record_id, recommendations, errors in results:
+                    stats["records"] += 1
+                    if errors:
+                        stats["errors"] += 1
+                        if err:
+                            errors = {(f"factor_{k}" if isinstance(k, int) else k): v for k, v in errors.items()}
+                            line = {"id": record_id, "errors": errors}
+                            err.write(json.dumps(line, ensure_ascii=False) + "\n")
+                    else:
+                        line = {"id": record_id, "recommendations": recommendations}
+                        out.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+            for chunk in chunks:
+                pending.append(pool.submit(process_chunk, engine, chunk))
+                if len(pending) >= 2 * workers:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    finally:
+        out.close()
+        if err:
+            err.close()
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетная обработка анкет экспертными системами lr4/lr5")
+    parser.add_argument("input", help="Файл анкет: CSV или JSONL")
+    parser.add_argument("output", help="Выходной JSONL-файл с рекомендациями")
+    parser.add_argument("--engine", choices=ENGINES, default="lr5",
+                        help="lr4 — прямые правила, lr5 — прямая цепочка, lr5-bitset — пакетная битовая сеть")
+    parser.add_argument("--errors", help="JSONL-файл для анкет с ошибками")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Анкет в одной порции")
+    parser.add_argument("--workers", type=int, help="Количество процессов (по умолчанию — число ядер)")
+    args = parser.parse_args(argv)
+
+    stats = run_batch(args.input, args.output, args.engine, args.errors, args.chunk_size, args.workers)
+    print(f"Обработано анкет: {stats['records']}, с ошибками: {stats['errors']}", file=sys.stderr)
+    print(f"Время: {stats['seconds']:.3f} с", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
+import argparse
+import json
+import sys
+import time
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
 import matplotlib.pyplot as plt
 import numpy as np
 import sympy as sp
 
+# Число параметров для каждого типа функции принадлежности
+MF_PARAM_COUNT = {"Треугольная": 3, "Трапециевидная": 4}
+# Допустимые обозначения типа в файле конфигурации
+MF_TYPE_ALIASES = {
+    "Треугольная": "Треугольная", "triangle": "Треугольная", "triangular": "Треугольная",
+    "Трапециевидная": "Трапециевидная", "trapezoid": "Трапециевидная", "trapezoidal": "Трапециевидная",
+}
+
 # --- Определение функций принадлежности ---
 def trapezoid_mf(x, a, b, c, d):
     """Функция принадлежности в форме трапеции."""
@@ -27,6 +39,22 @@ def triangle_mf(x, a, b, c):
         return (c - x) / (c - b)  # Убывание после пика
 
 
+def triangle_mf_np(x, a, b, c):
+    """Векторная версия triangle_mf для массива значений x."""
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = np.where(x < b, (x - a) / (b - a), (c - x) / (c - b))
+    return np.where((x <= a) | (x >= c), 0.0, y)
+
+
+def trapezoid_mf_np(x, a, b, c, d):
+    """Векторная версия trapezoid_mf для массива значений x."""
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = np.where(x < b, (x - a) / (b - a), np.where(x <= c, 1.0, (d - x) / (d - c)))
+    return np.where((x <= a) | (x >= d), 0.0, y)
+
+
 def is_linear_function(expr, var):
     """
     Проверяет, является ли выражение линейной функцией от заданной переменной.
@@ -35,6 +63,392 @@ def is_linear_function(expr, var):
     return expr.is_polynomial(var) and expr.as_poly(var).degree() <= 1
 
 
+def linear_coefficients(text):
+    """
+    Разбирает строку с функцией f_i(x) и возвращает коэффициенты (k, b) для f(x) = k*x + b.
+    Бросает ValueError, если функция не линейна.
+    """
+    x_symbol = sp.symbols('x')
+    expr = sp.sympify(text)
+    if not is_linear_function(expr, x_symbol):
+        raise ValueError(f"Функция не линейна: {expr}")
+    poly = expr.as_poly(x_symbol)
+    return float(poly.coeff_monomial(x_symbol)), float(poly.coeff_monomial(1))
+
+
+def load_model_config(path):
+    """
+    Загружает параметры модели Такаги-Сугено из JSON-файла вида:
+    {"type": "Треугольная", "params": [[0, 1, 2], ...], "functions": ["x", "2*x + 1", ...]}
+    Возвращает словарь с типом функций принадлежности, параметрами и коэффициентами f_i(x).
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    fp_type = MF_TYPE_ALIASES.get(config.get("type", "Треугольная"))
+    if fp_type is None:
+        raise ValueError(f"Неизвестный тип функции принадлежности: {config.get('type')}")
+
+    params = [list(map(float, p)) for p in config["params"]]
+    for p in params:
+        if len(p) != MF_PARAM_COUNT[fp_type]:
+            raise ValueError(f"Неверное количество параметров: {p}")
+
+    functions = [str(f) for f in config["functions"]]
+    if len(functions) != len(params):
+        raise ValueError("Количество функций f_i(x) должно совпадать с количеством правил")
+
+    return {
+        "type": fp_type,
+        "params": params,
+        "functions": functions,
+        "coeffs": np.array([linear_coefficients(f) for f in functions]),
+    }
+
+
+def ts_evaluate(x, fp_type, params, coeffs):
+    """
+    Векторное вычисление модели Такаги-Сугено y(x) = sum(mu_i(x) * (k_i*x + b_i))
+    сразу для массива значений x.
+    """
+    x = np.asarray(x, dtype=float)
+    mf = triangle_mf_np if fp_type == "Треугольная" else trapezoid_mf_np
+    y = np.zeros_like(x)
+    for p, (k, b) in zip(params, coeffs):
+        y += mf(x, *p) * (k * x + b)
+    return y
+
+
+def _mf_segment_coefficients(mids, fp_type, p):
+    """
+    Коэффициенты (s, t) линейного участка mu(x) = s*x + t функции принадлежности
+    на каждом сегменте между точками излома (сегмент задаётся своей серединой).
+    """
+    if fp_type == "Треугольная":
+        left, top_left, top_right, right = p[0], p[1], p[1], p[2]
+    else:
+        left, top_left, top_right, right = p
+    rising = (mids > left) & (mids < top_left)
+    plateau = (mids > top_left) & (mids < top_right)
+    falling = (mids > top_right) & (mids < right)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(rising, 1 / (top_left - left), np.where(falling, -1 / (right - top_right), 0.0))
+        t = np.where(rising, -left / (top_left - left), np.where(falling, right / (right - top_right), 0.0))
+    return s, np.where(plateau, 1.0, t)
+
+
+class PiecewiseTS:
+    """
+    Точное кусочное представление модели Такаги-Сугено.
+    Функции принадлежности и f_i(x) кусочно-линейны, поэтому между отсортированными
+    параметрами (точками излома) y(x) — квадратичный многочлен c2*x^2 + c1*x + c0.
+    Значение в точке ищется бинарным поиском по точкам излома: O(log B).
+    """
+
+    def __init__(self, fp_type, params, coeffs):
+        self.fp_type = fp_type
+        self.params = [list(p) for p in params]
+        self.coeffs = np.asarray(coeffs, dtype=float)
+        self.breakpoints = np.unique(np.concatenate([np.asarray(p, dtype=float) for p in params]))
+
+        # Коэффициенты многочлена на каждом сегменте [breakpoints[j], breakpoints[j+1])
+        mids = (self.breakpoints[:-1] + self.breakpoints[1:]) / 2
+        self.poly = np.zeros((mids.shape[0], 3))
+        for p, (k, b) in zip(self.params, self.coeffs):
+            s, t = _mf_segment_coefficients(mids, fp_type, p)
+            # (s*x + t) * (k*x + b) = s*k*x^2 + (s*b + t*k)*x + t*b
+            self.poly[:, 0] += s * k
+            self.poly[:, 1] += s * b + t * k
+            self.poly[:, 2] += t * b
+
+        # Значения в самих точках излома (важно для вырожденных функций, например a == b)
+        self.point_values = ts_evaluate(self.breakpoints, fp_type, self.params, self.coeffs)
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        n = self.breakpoints.shape[0]
+        idx = np.searchsorted(self.breakpoints, x, side='right') - 1
+        y = np.zeros_like(x)
+        if n > 1:
+            seg = np.clip(idx, 0, n - 2)
+            c2, c1, c0 = self.poly[seg, 0], self.poly[seg, 1], self.poly[seg, 2]
+            inside = (idx >= 0) & (idx < n - 1)
+            y = np.where(inside, (c2 * x + c1) * x + c0, 0.0)
+        # Точное значение в точках излома
+        at_point = (idx >= 0) & (self.breakpoints[np.clip(idx, 0, n - 1)] == x)
+        return np.where(at_point, self.point_values[np.clip(idx, 0, n - 1)], y)
+
+    def sample(self, points_per_segment=16):
+        """
+        Точки для построения графика по сегментам: линейные сегменты задаются двумя
+        концами, квадратичные — points_per_segment точками. Плотная сетка не нужна.
+        """
+        xs, ys = [], []
+        for j in range(self.poly.shape[0]):
+            lo, hi = self.breakpoints[j], self.breakpoints[j + 1]
+            n = 2 if self.poly[j, 0] == 0 else points_per_segment
+            x_seg = np.linspace(lo, hi, n)
+            xs.append(x_seg)
+            ys.append(np.polyval(self.poly[j], x_seg))
+        if not xs:
+            return self.breakpoints.copy(), self.point_values.copy()
+        return np.concatenate(xs), np.concatenate(ys)
+
+
+def mf_vertices(fp_type, p):
+    """Вершины ломаной функции принадлежности — по ним график строится точно."""
+    if fp_type == "Треугольная":
+        return [p[0], p[1], p[2]], [0.0, 1.0, 0.0]
+    return [p[0], p[1], p[2], p[3]], [0.0, 1.0, 1.0, 0.0]
+
+
+def iter_x_chunks(path, chunk_size, fmt="text", dtype="float64"):
+    """
+    Потоково читает значения x из файла порциями не более chunk_size значений.
+    Форматы: text — числа через пробелы/переводы строк, bin — сырой массив dtype,
+    npy — файл NumPy. Бинарные файлы отображаются в память (memmap) и не читаются целиком.
+    """
+    if fmt in ("bin", "npy"):
+        if fmt == "npy":
+            data = np.load(path, mmap_mode='r').reshape(-1)
+        else:
+            data = np.memmap(path, dtype=dtype, mode='r')
+        for start in range(0, data.shape[0], chunk_size):
+            yield np.asarray(data[start:start + chunk_size], dtype=float)
+        return
+
+    # Текст читаем блоками байт; неполное последнее число переносим в следующий блок,
+    # разобранные значения сверх chunk_size — в следующую порцию
+    block_bytes = chunk_size * 16
+    tail = b""
+    pending = np.empty(0)
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = max(block.rfind(b" "), block.rfind(b"\n"), block.rfind(b"\t"))
+            if cut < 0:
+                tail = block
+                continue
+            tail = block[cut + 1:]
+            values = np.array(block[:cut].split(), dtype=float)
+            pending = np.concatenate([pending, values]) if pending.size else values
+            while pending.shape[0] >= chunk_size:
+                yield pending[:chunk_size]
+                pending = pending[chunk_size:]
+    if tail.split():
+        pending = np.concatenate([pending, np.array(tail.split(), dtype=float)])
+    for start in range(0, pending.shape[0], chunk_size):
+        yield pending[start:start + chunk_size]
+
+
+def detect_format(path):
+    """Определяет формат файла по расширению."""
+    if path.endswith(".npy"):
+        return "npy"
+    if path.endswith((".bin", ".raw", ".f64", ".f32")):
+        return "bin"
+    return "text"
+
+
+def detect_dtype(path, dtype=None):
+    """Тип данных бинарного файла: явно заданный dtype или по расширению (.f32 — float32)."""
+    if dtype is not None:
+        return dtype
+    return "float32" if path.endswith(".f32") else "float64"
+
+
+def run_batch(config_path, input_path, output_path, chunk_size=1_000_000,
+              input_format=None, output_format=None, dtype=None):
+    """
+    Пакетный (без GUI) расчёт модели Такаги-Сугено для файла значений x.
+    Память ограничена размером одной порции, результат y пишется в output_path по мере расчёта.
+    Если dtype не задан, тип бинарных файлов определяется по расширению (.f32/.f64).
+    Возвращает статистику: количество значений, время и пропускную способность.
+    """
+    model = load_model_config(config_path)
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or detect_format(output_path)
+    if output_format not in ("text", "bin"):
+        # .npy требует заранее известной длины, которой у потокового текстового ввода нет
+        raise ValueError(f"Неподдерживаемый формат вывода: {output_format} (используйте text или bin)")
+
+    piecewise = PiecewiseTS(model["type"], model["params"], model["coeffs"])
+    input_dtype = detect_dtype(input_path, dtype)
+    output_dtype = detect_dtype(output_path, dtype)
+
+    total = 0
+    start = time.perf_counter()
+    with open(output_path, "wb") as out:
+        for x_chunk in iter_x_chunks(input_path, chunk_size, input_format, input_dtype):
+            y_chunk = piecewise(x_chunk)
+            if output_format == "bin":
+                y_chunk.astype(output_dtype).tofile(out)
+            else:
+                np.savetxt(out, y_chunk, fmt="%.17g")
+            total += x_chunk.shape[0]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "values": total,
+        "seconds": elapsed,
+        "values_per_second": total / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def membership_matrix(x, fp_type, params):
+    """Степени принадлежности всех точек всем правилам: матрица N x R."""
+    x = np.asarray(x, dtype=float)
+    mf = triangle_mf_np if fp_type == "Треугольная" else trapezoid_mf_np
+    return np.stack([mf(x, *p) for p in params], axis=1)
+
+
+def initial_params(x, fp_type, n_rules=5):
+    """
+    Равномерное начальное разбиение диапазона данных на n_rules функций принадлежности,
+    соседние функции в сумме дают 1.
+    """
+    centers = np.linspace(np.min(x), np.max(x), n_rules)
+    h = centers[1] - centers[0] if n_rules > 1 else 1.0
+    if fp_type == "Треугольная":
+        return [[c - h, c, c + h] for c in centers]
+    w = h / 4  # половина ширины плато
+    return [[c - h + w, c - w, c + w, c + h - w] for c in centers]
+
+
+def fit_consequents(x, y, fp_type, params, chunk_size=1_000_000):
+    """
+    Подбор коэффициентов f_i(x) = k_i*x + b_i по данным одним МНК-решением.
+    Строки глобальной матрицы плана: [mu_1*x, mu_1, ..., mu_R*x, mu_R].
+    Веса mu_i не нормируются, так же как в расчёте y(x) модели lr3, иначе
+    подобранные функции не совпали бы с моделью в интерфейсе.
+    Матрица плана обрабатывается порциями, в памяти копятся только Phi^T Phi и Phi^T y.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_cols = 2 * len(params)
+    gram = np.zeros((n_cols, n_cols))
+    rhs = np.zeros(n_cols)
+    for start in range(0, x.shape[0], chunk_size):
+        xc = x[start:start + chunk_size]
+        mu = membership_matrix(xc, fp_type, params)
+        phi = np.empty((xc.shape[0], n_cols))
+        phi[:, 0::2] = mu * xc[:, None]
+        phi[:, 1::2] = mu
+        gram += phi.T @ phi
+        rhs += phi.T @ y[start:start + chunk_size]
+    # lstsq вместо solve: правила без данных дают вырожденную систему
+    solution = np.linalg.lstsq(gram, rhs, rcond=None)[0]
+    return solution.reshape(-1, 2)
+
+
+def _mf_gradients(x, fp_type, p):
+    """
+    Производные функции принадлежности по её параметрам для всех точек: матрица N x len(p).
+    """
+    if fp_type == "Треугольная":
+        left, top_left, top_right, right = p[0], p[1], p[1], p[2]
+    else:
+        left, top_left, top_right, right = p
+    grads = np.zeros((x.shape[0], 4))
+    rising = (x > left) & (x < top_left)
+    falling = (x >= top_right) & (x < right) & ~rising
+    with np.errstate(divide='ignore', invalid='ignore'):
+        up = (top_left - left) ** 2
+        down = (right - top_right) ** 2
+        grads[:, 0] = np.where(rising, (x - top_left) / up, 0.0)
+        grads[:, 1] = np.where(rising, -(x - left) / up, 0.0)
+        grads[:, 2] = np.where(falling, (right - x) / down, 0.0)
+        grads[:, 3] = np.where(falling, (x - top_right) / down, 0.0)
+    if fp_type == "Треугольная":
+        # Вершина треугольника входит и в возрастающий, и в убывающий участок
+        return np.stack([grads[:, 0], grads[:, 1] + grads[:, 2], grads[:, 3]], axis=1)
+    return grads
+
+
+def refine_memberships(x, y, fp_type, params, coeffs, steps=50, learning_rate=0.01):
+    """
+    Уточнение параметров функций принадлежности градиентным спуском по MSE.
+    После каждого шага коэффициенты f_i(x) пересчитываются МНК (гибридное обучение).
+    Возвращает лучшие найденные параметры, коэффициенты и MSE.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    params = [list(map(float, p)) for p in params]
+    coeffs = np.asarray(coeffs, dtype=float)
+    best = (params, coeffs, np.inf)
+
+    for step in range(steps + 1):
+        residual = ts_evaluate(x, fp_type, params, coeffs) - y
+        mse = np.mean(residual ** 2)
+        if mse < best[2]:
+            best = (params, coeffs, mse)
+        if step == steps:
+            break
+
+        new_params = []
+        for p, (k, b) in zip(params, coeffs):
+            weight = residual * (k * x + b)
+            grad = 2 * (weight[:, None] * _mf_gradients(x, fp_type, p)).mean(axis=0)
+            grad = np.nan_to_num(grad)
+            new_params.append(sorted(np.asarray(p) - learning_rate * grad))
+        params = [list(map(float, p)) for p in new_params]
+        coeffs = fit_consequents(x, y, fp_type, params)
+    return best
+
+
+def format_linear_function(k, b):
+    """Запись коэффициентов в виде строки f(x), понятной sympy и полям ввода."""
+    sign = "+" if b >= 0 else "-"
+    return f"{k:.10g}*x {sign} {abs(b):.10g}"
+
+
+def load_xy(path, x_column="x1", y_column="y"):
+    """Читает столбцы x и y из CSV-файла с заголовком (например, pr1/generated_dataset.csv)."""
+    with open(path, encoding="utf-8") as f:
+        header = f.readline().strip().split(",")
+    for column in (x_column, y_column):
+        if column not in header:
+            raise ValueError(f"Столбец {column} не найден в {path}")
+    data = np.loadtxt(path, delimiter=",", skiprows=1,
+                      usecols=(header.index(x_column), header.index(y_column)))
+    return data[:, 0], data[:, 1]
+
+
+def run_fit(data_path, output_path, x_column="x1", y_column="y", fp_type="Треугольная",
+            n_rules=5, config_path=None, refine_steps=0, learning_rate=0.01):
+    """
+    Подбирает модель по данным и сохраняет её в JSON-конфигурацию,
+    которую понимают пакетный режим и кнопка загрузки в интерфейсе.
+    """
+    start = time.perf_counter()
+    x, y = load_xy(data_path, x_column, y_column)
+    if config_path:
+        model = load_model_config(config_path)
+        fp_type, params = model["type"], model["params"]
+    else:
+        fp_type = MF_TYPE_ALIASES[fp_type]
+        params = initial_params(x, fp_type, n_rules)
+
+    coeffs = fit_consequents(x, y, fp_type, params)
+    mse = np.mean((ts_evaluate(x, fp_type, params, coeffs) - y) ** 2)
+    if refine_steps:
+        params, coeffs, mse = refine_memberships(x, y, fp_type, params, coeffs,
+                                                 refine_steps, learning_rate)
+
+    config = {
+        "type": fp_type,
+        "params": [[round(v, 10) for v in p] for p in params],
+        "functions": [format_linear_function(k, b) for k, b in coeffs],
+    }
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=4)
+
+    return {"samples": x.shape[0], "mse": float(mse), "seconds": time.perf_counter() - start}
+
+
 class FuzzyApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -52,31 +466,24 @@ class FuzzyApp(tk.Tk):
                                      command=self.update_input_fields)
         fp_type_menu.grid(row=0, column=1, sticky="w")
 
-        # --- Поля для ввода параметров функций принадлежности ---
-        self.param_entries = []
-        for i in range(5):  # Предполагаем 5 правил/функций принадлежности
-            tk.Label(self.inputs_frame, text=f"A{i+1} параметры:").grid(row=i+1, column=0, sticky="w")
-            entry = tk.Entry(self.inputs_frame, width=30)
-            entry.grid(row=i+1, column=1, sticky="w")
-            self.param_entries.append(entry)
+        # --- Поле для ввода значений x (размещается под строками правил) ---
+        self.x_label = tk.Label(self.inputs_frame, text="Значения x (через пробел):")
+        self.x_entry = tk.Entry(self.inputs_frame, width=60)
 
-        # --- Поля для ввода линейных функций f_i(x) ---
+        # --- Поля для ввода параметров функций принадлежности и линейных функций f_i(x) ---
+        self.param_entries = []
         self.func_entries = []
-        for i in range(5):
-            tk.Label(self.inputs_frame, text=f"f{i+1}(x):").grid(row=i+1, column=2, sticky="w")
-            entry = tk.Entry(self.inputs_frame, width=30)
-            entry.grid(row=i+1, column=3, sticky="w")
-            self.func_entries.append(entry)
-
-        # --- Поле для ввода значений x ---
-        tk.Label(self.inputs_frame, text="Значения x (через пробел):").grid(row=6, column=0, sticky="w")
-        self.x_entry = tk.Entry(self.inputs_frame, width=60)
-        self.x_entry.grid(row=6, column=1, columnspan=3, sticky="w")
+        self.rule_labels = []
+        self.build_rule_rows(5)  # По умолчанию 5 правил/функций принадлежности
 
         # --- Кнопка запуска вычисления и отрисовки ---
         self.calc_btn = tk.Button(self, text="Рассчитать и построить графики", command=self.run)
         self.calc_btn.pack(pady=10)
 
+        # --- Кнопка загрузки параметров из файла (например, подобранных командой fit) ---
+        self.load_btn = tk.Button(self, text="Загрузить конфигурацию...", command=self.load_config)
+        self.load_btn.pack(pady=5)
+
         # --- Заполнение полей значениями по умолчанию ---
         self.set_default_values()
 
@@ -111,6 +518,10 @@ class FuzzyApp(tk.Tk):
 
         x_defaults = "0 1 2 3 4 5"
 
+        # После загрузки конфигурации число правил могло измениться
+        if len(self.param_entries) != len(function_defaults):
+            self.build_rule_rows(len(function_defaults))
+
         # Обновляем поля в зависимости от типа функции принадлежности
         if self.fp_type.get() == "Треугольная":
             for i, entry in enumerate(self.param_entries):
@@ -128,95 +539,115 @@ class FuzzyApp(tk.Tk):
         self.x_entry.delete(0, tk.END)
         self.x_entry.insert(0, x_defaults)
 
-    def update_input_fields(self, *args):
+    def build_rule_rows(self, count):
         """
-        Обновляет количество полей для ввода параметров в зависимости от выбранного типа функции принадлежности.
-        При смене типа очищает старые поля и создаёт новые.
+        Пересоздаёт строки ввода правил: параметры A_i и функции f_i(x) для count правил.
+        Поле значений x переносится под последнюю строку.
         """
-        # Скрываем старые поля
-        for entry in self.param_entries:
-            entry.grid_forget()
+        for widget in self.param_entries + self.func_entries + self.rule_labels:
+            widget.destroy()
         self.param_entries.clear()
+        self.func_entries.clear()
+        self.rule_labels.clear()
 
-        # Обновляем интерфейс под тип функции
-        if self.fp_type.get() == "Треугольная":
-            for i in range(5):
-                tk.Label(self.inputs_frame, text=f"A{i+1} параметры:").grid(row=i+1, column=0, sticky="w")
-                entry = tk.Entry(self.inputs_frame, width=30)
-                entry.grid(row=i+1, column=1, sticky="w")
-                self.param_entries.append(entry)
-        elif self.fp_type.get() == "Трапециевидная":
-            for i in range(5):
-                tk.Label(self.inputs_frame, text=f"A{i+1} параметры:").grid(row=i+1, column=0, sticky="w")
-                entry = tk.Entry(self.inputs_frame, width=30)
-                entry.grid(row=i+1, column=1, sticky="w")
-                self.param_entries.append(entry)
-
-        # Устанавливаем значения по умолчанию
+        for i in range(count):
+            labels = (tk.Label(self.inputs_frame, text=f"A{i+1} параметры:"),
+                      tk.Label(self.inputs_frame, text=f"f{i+1}(x):"))
+            labels[0].grid(row=i+1, column=0, sticky="w")
+            labels[1].grid(row=i+1, column=2, sticky="w")
+            self.rule_labels.extend(labels)
+
+            entry = tk.Entry(self.inputs_frame, width=30)
+            entry.grid(row=i+1, column=1, sticky="w")
+            self.param_entries.append(entry)
+
+            entry = tk.Entry(self.inputs_frame, width=30)
+            entry.grid(row=i+1, column=3, sticky="w")
+            self.func_entries.append(entry)
+
+        self.x_label.grid(row=count+1, column=0, sticky="w")
+        self.x_entry.grid(row=count+1, column=1, columnspan=3, sticky="w")
+
+    def update_input_fields(self, *args):
+        """
+        Обновляет поля ввода при смене типа функции принадлежности:
+        возвращает стандартное число правил и значения по умолчанию.
+        """
         self.set_default_values()
 
+    def load_config(self, path=None):
+        """
+        Заполняет поля формы параметрами из JSON-конфигурации.
+        Без аргумента спрашивает путь к файлу.
+        """
+        try:
+            if path is None:
+                path = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+                if not path:
+                    return
+            model = load_model_config(path)
+
+            # Число строк ввода берётся из файла: fit --rules N сохраняет любое число правил
+            self.fp_type.set(model["type"])
+            self.build_rule_rows(len(model["params"]))
+            for entry, p in zip(self.param_entries, model["params"]):
+                entry.delete(0, tk.END)
+                entry.insert(0, ' '.join(f"{v:g}" for v in p))
+            for entry, func in zip(self.func_entries, model["functions"]):
+                entry.delete(0, tk.END)
+                entry.insert(0, func)
+        except Exception as e:
+            messagebox.showerror("Ошибка", str(e))
+
     def run(self):
         """
         Основной обработчик кнопки. Получает данные из формы,
         выполняет расчёт модели Такаги-Сугено и строит графики.
         """
         try:
-            x_symbol = sp.symbols('x')  # Символическая переменная для анализа
+            fp_type = self.fp_type.get()
 
             # --- Чтение параметров функций принадлежности ---
             params = []
             for entry in self.param_entries:
                 values = list(map(float, entry.get().split()))
-                expected_len = 4 if self.fp_type.get() == "Трапециевидная" else 3
+                expected_len = MF_PARAM_COUNT[fp_type]
                 if len(values) != expected_len:
                     raise ValueError(f"Неверное количество параметров: {values}")
                 params.append(values)
 
-            # --- Чтение и проверка функций f_i(x) ---
-            functions = []
-            for entry in self.func_entries:
-                expr = sp.sympify(entry.get())
-                if not is_linear_function(expr, x_symbol):
-                    raise ValueError(f"Функция не линейна: {expr}")
-                # Преобразуем в функцию, которую можно использовать с NumPy
-                functions.append(sp.lambdify(x_symbol, expr, 'numpy'))
+            # --- Чтение и проверка функций f_i(x): коэффициенты k_i, b_i ---
+            coeffs = np.array([linear_coefficients(entry.get()) for entry in self.func_entries])
 
             # --- Чтение значений x для расчёта ---
-            x_vals = list(map(float, self.x_entry.get().split()))
+            x_vals = np.array(list(map(float, self.x_entry.get().split())))
 
-            # --- Выбор функции принадлежности на основе выбора пользователя ---
-            if self.fp_type.get() == "Треугольная":
-                mus = [lambda x_val, p=p: triangle_mf(x_val, *p) for p in params]
-            else:
-                mus = [lambda x_val, p=p: trapezoid_mf(x_val, *p) for p in params]
-
-            # --- Модель Такаги-Сугено: y(x) = sum(mu_i(x)*f_i(x)) ---
-            def y_ts(x_val):
-                return sum(m(x_val) * f(x_val) for m, f in zip(mus, functions))
+            # --- Модель Такаги-Сугено y(x) = sum(mu_i(x)*f_i(x)) в кусочном виде ---
+            model = PiecewiseTS(fp_type, params, coeffs)
 
             # --- Выводим результаты расчётов для каждого x ---
             print("Значения y(x):")
-            for xv in x_vals:
-                print(f"y({xv}) = {y_ts(xv)}")
+            for xv, yv in zip(x_vals, model(x_vals)):
+                print(f"y({xv}) = {yv}")
 
             # --- Подготовка диапазонов для построения графиков ---
             intervals = [(min(p), max(p)) for p in params]
             x_min = min(i[0] for i in intervals)
             x_max = max(i[1] for i in intervals)
-            xs = np.linspace(x_min, x_max, 300)
 
-            # --- График функций f_i(x) ---
+            # --- График функций f_i(x): прямые задаются концами отрезка ---
             fig, axs = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
-            for i, (func, interval) in enumerate(zip(functions, intervals)):
-                x_plot = np.linspace(interval[0], interval[1], 100)
-                axs[0].plot(x_plot, func(x_plot), label=f"f{i+1}(x)")
+            for i, ((k, b), interval) in enumerate(zip(coeffs, intervals)):
+                x_plot = np.array(interval)
+                axs[0].plot(x_plot, k * x_plot + b, label=f"f{i+1}(x)")
             axs[0].set_title("Линейные функции")
             axs[0].legend()
             axs[0].grid(True)
 
-            # --- График функций принадлежности mu_i(x) ---
-            for i, mf in enumerate(mus):
-                axs[1].plot(xs, [mf(x_val) for x_val in xs], label=f"mu A{i+1}")
+            # --- График функций принадлежности mu_i(x) по вершинам ломаной ---
+            for i, p in enumerate(params):
+                vx, vy = mf_vertices(fp_type, p)
+                axs[1].plot([x_min] + vx + [x_max], [0.0] + vy + [0.0], label=f"mu A{i+1}")
             axs[1].set_title("Функции принадлежности")
             axs[1].set_ylim(-0.05, 1.05)
             axs[1].legend()
@@ -225,8 +656,8 @@ class FuzzyApp(tk.Tk):
             plt.tight_layout()
             plt.show()
 
-            # --- Результирующая модель Такаги-Сугено ---
-            y_vals = [y_ts(xi) for xi in xs]
+            # --- Результирующая модель Такаги-Сугено строится по сегментам ---
+            xs, y_vals = model.sample()
             plt.figure(figsize=(10, 5))
             plt.plot(xs, y_vals, 'r-', label="y(x) — TS модель")
             plt.title("Результирующая функция Такаги-Сугено")
@@ -241,7 +672,58 @@ class FuzzyApp(tk.Tk):
             messagebox.showerror("Ошибка", str(e))
 
 
+def main(argv=None):
+    """
+    Точка входа. Без аргументов запускает графический интерфейс,
+    команда batch выполняет расчёт по файлу без GUI, команда fit подбирает модель по данным.
+    """
+    parser = argparse.ArgumentParser(description="Модель Такаги-Сугено")
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser("batch", help="Пакетный расчёт y(x) по файлу значений x")
+    batch.add_argument("config", help="JSON-файл с параметрами правил и функциями f_i(x)")
+    batch.add_argument("input", help="Файл со значениями x (text/bin/npy)")
+    batch.add_argument("output", help="Файл для значений y (text/bin)")
+    batch.add_argument("--chunk-size", type=int, default=1_000_000, help="Размер порции (значений)")
+    batch.add_argument("--input-format", choices=["text", "bin", "npy"], help="Формат входного файла")
+    batch.add_argument("--output-format", choices=["text", "bin"], help="Формат выходного файла")
+    batch.add_argument("--dtype", help="Тип данных для бинарных файлов (по умолчанию по расширению, иначе float64)")
+
+    fit = subparsers.add_parser("fit", help="Подбор f_i(x) (и функций принадлежности) по данным")
+    fit.add_argument("data", help="CSV-файл с данными, например pr1/generated_dataset.csv")
+    fit.add_argument("output", help="JSON-файл для подобранной конфигурации")
+    fit.add_argument("--x-column", default="x1", help="Столбец входной переменной")
+    fit.add_argument("--y-column", default="y", help="Столбец выходной переменной")
+    fit.add_argument("--type", default="Треугольная", choices=sorted(MF_TYPE_ALIASES),
+                     help="Тип функций принадлежности для начального разбиения")
+    fit.add_argument("--rules", type=int, default=5, help="Количество правил")
+    fit.add_argument("--config", help="Начальные функции принадлежности из JSON вместо равномерного разбиения")
+    fit.add_argument("--refine-steps", type=int, default=0, help="Шаги градиентного уточнения функций принадлежности")
+    fit.add_argument("--learning-rate", type=float, default=0.01, help="Шаг градиентного спуска")
+
+    parser.add_argument("--config", dest="gui_config", help="Открыть интерфейс с параметрами из JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "fit":
+        stats = run_fit(args.data, args.output, args.x_column, args.y_column, args.type,
+                        args.rules, args.config, args.refine_steps, args.learning_rate)
+        print(f"Точек данных: {stats['samples']}", file=sys.stderr)
+        print(f"MSE: {stats['mse']:.6g}", file=sys.stderr)
+        print(f"Время: {stats['seconds']:.3f} с", file=sys.stderr)
+    elif args.command == "batch":
+        stats = run_batch(args.config, args.input, args.output, args.chunk_size,
+                          args.input_format, args.output_format, args.dtype)
+        print(f"Обработано значений: {stats['values']}", file=sys.stderr)
+        print(f"Время: {stats['seconds']:.3f} с", file=sys.stderr)
+        print(f"Пропускная способность: {stats['values_per_second']:.0f} значений/с", file=sys.stderr)
+    else:
+        app = FuzzyApp()
+        if args.gui_config:
+            app.load_config(args.gui_config)
+        app.mainloop()
+
+
 # --- Точка входа в приложение ---
 if __name__ == "__main__":
-    app = FuzzyApp()
-    app.mainloop()
\ No newline at end of file
+    main()
\ No newline at end of file
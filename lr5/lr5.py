@@ -1,3 +1,18 @@
+import argparse
+import hashlib
+import json
+import operator
+import os
+import pickle
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+# Номера исходных факторов анкеты
+FACTORS = range(1, 12)
+
 def ask_question(factor):
     """Задаёт вопрос пользователю в зависимости от фактора"""
     questions = {
@@ -36,130 +51,245 @@ def validate_input(factor, raw_input):
 def collect_data():
     """Собирает данные от пользователя"""
     data = {}
-    for factor in range(1, 12):
+    for factor in FACTORS:
         data[factor] = validate_input(factor, ask_question(factor))
     return data
 
-# Структура правил прямой цепочки (fact -> [new_facts])
-rules = [
-    # Уровень 2: Промежуточные причины
-    {
-        "type": "single",
-        "factor": "factor_3",
-        "condition": lambda x: x < 2,
-        "result": "low_study_time"
-    },
-    {
-        "type": "single",
-        "factor": "factor_5",
-        "condition": lambda x: x == "низкая",
-        "result": "low_discipline"
-    },
-    {
-        "type": "single",
-        "factor": "factor_6",
-        "condition": lambda x: x > 3,
-        "result": "high_distractions"
-    },
-    {
-        "type": "single",
-        "factor": "factor_2",
-        "condition": lambda x: x < 5,
-        "result": "low_knowledge"
-    },
-    {
-        "type": "single",
-        "factor": "factor_4",
-        "condition": lambda x: x == "да",
-        "result": "difficult_topics"
-    },
-    {
-        "type": "single",
-        "factor": "factor_7",
-        "condition": lambda x: x == "низкая",
-        "result": "inefficient_methods"
-    },
-    {
-        "type": "single",
-        "factor": "factor_1",
-        "condition": lambda x: x < 7,
-        "result": "limited_time"
-    },
-    {
-        "type": "single",
-        "factor": "factor_9",
-        "condition": lambda x: x == "нет",
-        "result": "no_resources"
-    },
-    {
-        "type": "single",
-        "factor": "factor_11",
-        "condition": lambda x: x == "нет",
-        "result": "no_support"
-    },
-    
-    # Уровень 3: Комбинации причин
-    {
-        "type": "combination",
-        "factors": ["low_study_time", "low_discipline"],
-        "result": "plan_needed"
-    },
-    {
-        "type": "combination",
-        "factors": ["difficult_topics", "inefficient_methods"],
-        "result": "active_review_needed"
-    },
-    {
-        "type": "combination",
-        "factors": ["limited_time", "low_knowledge"],
-        "result": "increase_time_needed"
-    },
-    {
-        "type": "combination",
-        "factors": ["difficult_topics", "no_resources", "no_support"],
-        "result": "help_needed"
-    },
-    
-    # Уровень 4: Рекомендации
-    {
-        "type": "recommendation",
-        "source": "plan_needed",
-        "text": "Создать детальный план подготовки"
-    },
-    {
-        "type": "recommendation",
-        "source": "active_review_needed",
-        "text": "Использовать методы активного повторения"
-    },
-    {
-        "type": "recommendation",
-        "source": "increase_time_needed",
-        "text": "Увеличить время подготовки"
-    },
-    {
-        "type": "recommendation",
-        "source": "help_needed",
-        "text": "Обратиться за помощью"
+# Правила прямой цепочки хранятся декларативно в rules.json:
+#   {"type": "single", "factor": "factor_3", "op": "<", "value": 2, "result": "low_study_time"}
+#   {"type": "combination", "factors": ["low_study_time", "low_discipline"], "result": "plan_needed"}
+#   {"type": "recommendation", "source": "plan_needed", "text": "Создать детальный план подготовки"}
+# Уровни: одиночные условия (уровень 2), комбинации причин (уровень 3), рекомендации (уровень 4).
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json")
+# Версия структуры скомпилированных правил; увеличивается при изменении индекса или сети,
+# чтобы не использовать устаревший кэш
+RULES_CACHE_VERSION = 3
+
+class Condition:
+    """Условие одиночного правила вида «значение <op> порог», работает и со столбцами NumPy"""
+    OPERATORS = {
+        "<": operator.lt,
+        "<=": operator.le,
+        ">": operator.gt,
+        ">=": operator.ge,
+        "==": operator.eq,
+        "!=": operator.ne,
     }
-]
 
-def apply_rules(facts):
-    """Применяет правила прямой цепочки для вывода новых фактов"""
+    def __init__(self, op, value):
+        self.op = op
+        self.value = value
+
+    def __call__(self, x):
+        if self.op == "in":
+            if isinstance(x, np.ndarray):
+                return np.isin(x, self.value)
+            return x in self.value
+        return self.OPERATORS[self.op](x, self.value)
+
+    def __repr__(self):
+        return f"Condition({self.op!r}, {self.value!r})"
+
+def validate_rules(raw_rules):
+    """Проверяет декларативные правила, при ошибке бросает ValueError с номером правила"""
+    if not isinstance(raw_rules, list):
+        raise ValueError("Файл правил должен содержать список")
+    derived = {rule.get("result") for rule in raw_rules if isinstance(rule, dict)}
+    for n, rule in enumerate(raw_rules, start=1):
+        kind = rule.get("type") if isinstance(rule, dict) else None
+        if kind == "single":
+            required = ("factor", "op", "value", "result")
+        elif kind == "combination":
+            required = ("factors", "result")
+        elif kind == "recommendation":
+            required = ("source", "text")
+        else:
+            raise ValueError(f"Правило {n}: неизвестный тип {kind!r}")
+        missing = [key for key in required if key not in rule]
+        if missing:
+            raise ValueError(f"Правило {n}: нет полей {', '.join(missing)}")
+
+        if kind == "single":
+            op, value = rule["op"], rule["value"]
+            if op == "in":
+                if not isinstance(value, list):
+                    raise ValueError(f"Правило {n}: для 'in' значение должно быть списком")
+            elif op not in Condition.OPERATORS:
+                raise ValueError(f"Правило {n}: неизвестный оператор {op!r}")
+            elif op in ("<", "<=", ">", ">=") and not isinstance(value, (int, float)):
+                raise ValueError(f"Правило {n}: для {op!r} порог должен быть числом")
+        elif kind == "combination":
+            if not rule["factors"]:
+                raise ValueError(f"Правило {n}: пустой список посылок")
+            unknown = [fact for fact in rule["factors"] if fact not in derived]
+            if unknown:
+                raise ValueError(f"Правило {n}: посылки не выводятся ни одним правилом: {', '.join(unknown)}")
+        elif rule["source"] not in derived:
+            raise ValueError(f"Правило {n}: факт {rule['source']!r} не выводится ни одним правилом")
+
+def compile_rules(raw_rules):
+    """Превращает проверенные декларативные правила в рабочий список правил"""
+    compiled = []
+    for rule in raw_rules:
+        rule = dict(rule)
+        if rule["type"] == "single":
+            rule["condition"] = Condition(rule["op"], rule["value"])
+        compiled.append(rule)
+    return compiled
+
+def build_rule_index(rules):
+    """Строит индекс правил по фактам, от которых они зависят"""
+    by_fact = {}
+    by_result = {}
+    premise_count = []
+    for i, rule in enumerate(rules):
+        if "result" in rule:
+            by_result.setdefault(rule["result"], []).append(i)
+        if rule["type"] == "single":
+            premises = [rule["factor"]]
+        elif rule["type"] == "combination":
+            premises = list(dict.fromkeys(rule["factors"]))  # без повторов
+        else:
+            premises = []
+        for fact in premises:
+            by_fact.setdefault(fact, []).append(i)
+        premise_count.append(len(premises))
+    return {"rules": rules, "by_fact": by_fact, "by_result": by_result, "premise_count": premise_count}
+
+class InferenceTrace:
+    """
+    Трассировка одного вывода: проверенные и сработавшие правила (номера в списке rules),
+    происхождение каждого выведенного факта, число проходов и время.
+    """
+
+    def __init__(self):
+        self.evaluated = []
+        self.fired = []
+        self.derivations = {}  # факт -> (номер правила, посылки)
+        self.passes = 0
+        self.seconds = 0.0
+
+    def record_fire(self, rule_number, rule):
+        self.fired.append(rule_number)
+        premises = [rule["factor"]] if rule["type"] == "single" else list(rule["factors"])
+        self.derivations[rule["result"]] = (rule_number, premises)
+
+    def chain(self, fact):
+        """Цепочка вывода факта: список (факт, номер правила, посылки) от факта к исходным данным"""
+        result = []
+        stack = [fact]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current in seen or current not in self.derivations:
+                continue
+            seen.add(current)
+            rule_number, premises = self.derivations[current]
+            result.append((current, rule_number, premises))
+            stack.extend(reversed(premises))
+        return result
+
+    def summary(self):
+        return {
+            "evaluated": len(self.evaluated),
+            "fired": len(self.fired),
+            "passes": self.passes,
+            "seconds": self.seconds,
+        }
+
+class TraceSampler:
+    """
+    Выборочная трассировка для постоянной работы: start() возвращает новую трассировку
+    с вероятностью rate (иначе None), последние maxlen трассировок хранятся в traces.
+    """
+
+    def __init__(self, rate=0.01, maxlen=100, seed=None):
+        self.rate = rate
+        self.traces = deque(maxlen=maxlen)
+        self._random = random.Random(seed)
+
+    def start(self):
+        if self._random.random() >= self.rate:
+            return None
+        trace = InferenceTrace()
+        self.traces.append(trace)
+        return trace
+
+def apply_rules(facts, index=None, trace=None):
+    """
+    Применяет правила прямой цепочки через агенду.
+    Каждый новый факт просматривает только зависящие от него правила, для комбинаций
+    ведётся счётчик ещё не выполненных посылок. Правило срабатывает не более одного раза,
+    в момент появления последней посылки.
+    trace — необязательная InferenceTrace; без неё трассировка стоит одну проверку,
+    passes в ней — число обработанных агендой фактов.
+    """
+    if trace is not None:
+        started = time.perf_counter()
+    if index is None:
+        index = RULE_INDEX
+    index_rules = index["rules"]
+    by_fact = index["by_fact"]
+    remaining = list(index["premise_count"])
+    agenda = deque(facts)
+
+    while agenda:
+        fact = agenda.popleft()
+        if trace is not None:
+            trace.passes += 1
+        for i in by_fact.get(fact, ()):
+            rule = index_rules[i]
+            if rule["type"] == "single":
+                if trace is not None:
+                    trace.evaluated.append(i)
+                factor_value = facts[fact]
+                if factor_value is None or not rule["condition"](factor_value):
+                    continue
+            else:
+                remaining[i] -= 1
+                if remaining[i] > 0:
+                    continue
+                if trace is not None:
+                    trace.evaluated.append(i)
+            if rule["result"] not in facts:
+                facts[rule["result"]] = True
+                agenda.append(rule["result"])
+                if trace is not None:
+                    trace.record_fire(i, rule)
+
+    if trace is not None:
+        trace.seconds = time.perf_counter() - started
+    return facts
+
+def apply_rules_passes(facts, trace=None):
+    """Применяет правила прямой цепочки полными проходами по списку правил (исходный вариант)"""
+    if trace is not None:
+        started = time.perf_counter()
     changed = True
     while changed:
         changed = False
+        if trace is not None:
+            trace.passes += 1
         # Обрабатываем одиночные условия
-        for rule in rules:
+        for i, rule in enumerate(rules):
+            if trace is not None and rule["type"] != "recommendation":
+                trace.evaluated.append(i)
             if rule["type"] == "single":
                 factor_value = facts.get(rule["factor"], None)
                 if factor_value is not None and rule["condition"](factor_value):
                     if rule["result"] not in facts:
                         facts[rule["result"]] = True
                         changed = True
+                        if trace is not None:
+                            trace.record_fire(i, rule)
             elif rule["type"] == "combination":
                 if all(fact in facts for fact in rule["factors"]) and rule["result"] not in facts:
                     facts[rule["result"]] = True
                     changed = True
+                    if trace is not None:
+                        trace.record_fire(i, rule)
+    if trace is not None:
+        trace.seconds = time.perf_counter() - started
     return facts
 
 def get_recommendations(facts):
@@ -170,22 +300,268 @@ def get_recommendations(facts):
             recommendations.append(rule["text"])
     return recommendations
 
-def main():
+def ask_factor(factor_name):
+    """Запрашивает у пользователя значение фактора по имени вида factor_N"""
+    factor = int(factor_name.split("_")[1])
+    return validate_input(factor, ask_question(factor))
+
+def backward_chain(ask=None, index=None):
+    """
+    Обратная цепочка: рекомендации проверяются как цели, факты выводятся по требованию.
+    Значение исходного фактора запрашивается через ask(имя фактора) только тогда,
+    когда его действительно проверяет правило; выведенные факты запоминаются.
+    Возвращает (рекомендации, факты, статистика вопросов).
+    """
+    if ask is None:
+        ask = ask_factor
+    if index is None:
+        index = RULE_INDEX
+    index_rules = index["rules"]
+    by_result = index["by_result"]
+    facts = {}
+    proven = {}
+    stats = {"asked": 0, "memo_hits": 0}
+
+    def value_of(name):
+        if name not in facts:
+            facts[name] = ask(name)
+            stats["asked"] += 1
+        return facts[name]
+
+    def prove(goal):
+        if goal in proven:
+            stats["memo_hits"] += 1
+            return proven[goal]
+        if goal not in by_result:
+            # Исходный фактор: истинен, если известен
+            return value_of(goal) is not None
+        proven[goal] = False  # защита от циклов, пока цель доказывается
+        for i in by_result[goal]:
+            rule = index_rules[i]
+            if rule["type"] == "single":
+                value = value_of(rule["factor"]) if rule["factor"] not in by_result else prove(rule["factor"])
+                ok = value is not None and rule["condition"](value)
+            else:
+                ok = all(prove(fact) for fact in rule["factors"])
+            if ok:
+                proven[goal] = True
+                facts[goal] = True
+                break
+        return proven[goal]
+
+    recommendations = [rule["text"] for rule in index_rules
+                       if rule["type"] == "recommendation" and prove(rule["source"])]
+    stats["avoided"] = len(FACTORS) - stats["asked"]
+    return recommendations, facts, stats
+
+def compile_rule_network(rules):
+    """
+    Компилирует список правил для пакетной обработки анкет:
+    каждому выводимому факту назначается целочисленный номер (бит в битовой маске),
+    комбинации превращаются в маски посылок.
+    """
+    fact_ids = {}
+
+    def fact_id(name):
+        return fact_ids.setdefault(name, len(fact_ids))
+
+    singles = []
+    combinations = []
+    recommendations = []
+    for rule in rules:
+        if rule["type"] == "single":
+            singles.append((rule["factor"], rule["condition"], fact_id(rule["result"])))
+        elif rule["type"] == "combination":
+            premises = [fact_id(f) for f in rule["factors"]]
+            combinations.append((premises, fact_id(rule["result"])))
+        elif rule["type"] == "recommendation":
+            recommendations.append((fact_id(rule["source"]), rule["text"]))
+
+    n_words = max(1, (len(fact_ids) + 63) // 64)
+
+    def mask_of(ids):
+        mask = np.zeros(n_words, dtype=np.uint64)
+        for i in ids:
+            mask[i // 64] |= np.uint64(1) << np.uint64(i % 64)
+        return mask
+
+    return {
+        "fact_ids": fact_ids,
+        "n_words": n_words,
+        "singles": singles,
+        "combinations": [(mask_of(premises), result) for premises, result in combinations],
+        "recommendations": recommendations,
+    }
+
+class _RulesPickler(pickle.Pickler):
+    """
+    Сохраняет Condition как (op, value), а не ссылкой на класс: модуль импортируется
+    как lr5, lr5.lr5 или __main__, и кэш не должен зависеть от его имени
+    """
+    def persistent_id(self, obj):
+        if isinstance(obj, Condition):
+            return ("Condition", obj.op, obj.value)
+        return None
+
+class _RulesUnpickler(pickle.Unpickler):
+    """Восстанавливает Condition классом текущего модуля"""
+    def persistent_load(self, pid):
+        kind, op, value = pid
+        if kind != "Condition":
+            raise pickle.UnpicklingError(f"Неизвестный объект в кэше правил: {kind}")
+        return Condition(op, value)
+
+def load_rules(path=RULES_PATH, cache_dir=None):
+    """
+    Загружает правила из JSON, проверяет и компилирует их один раз.
+    Скомпилированная форма (правила, индекс, битовая сеть) сохраняется в кэш,
+    ключ кэша — SHA-256 содержимого файла, поэтому повторная загрузка не разбирает
+    и не проверяет правила заново. Устаревшие файлы кэша удаляются при записи нового.
+    Результат сериализуется pickle и может передаваться в рабочие процессы.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), "__pycache__")
+    cache_name = f"rules-v{RULES_CACHE_VERSION}-{digest[:16]}.pickle"
+    cache_path = os.path.join(cache_dir, cache_name)
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached = _RulesUnpickler(f).load()
+        if cached.get("digest") == digest:
+            return cached
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    raw_rules = json.loads(content.decode("utf-8"))
+    validate_rules(raw_rules)
+    compiled_rules = compile_rules(raw_rules)
+    compiled = {
+        "digest": digest,
+        "rules": compiled_rules,
+        "index": build_rule_index(compiled_rules),
+        "network": compile_rule_network(compiled_rules),
+    }
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            _RulesPickler(f).dump(compiled)
+        for name in os.listdir(cache_dir):
+            if name.startswith("rules-") and name.endswith(".pickle") and name != cache_name:
+                os.remove(os.path.join(cache_dir, name))
+    except OSError:
+        pass  # кэш необязателен, например при доступе только для чтения
+    return compiled
+
+_COMPILED_RULES = load_rules()
+rules = _COMPILED_RULES["rules"]
+RULE_INDEX = _COMPILED_RULES["index"]
+RULE_NETWORK = _COMPILED_RULES["network"]
+
+def records_to_columns(records):
+    """Переводит список анкет {номер фактора: значение} в столбцы {"factor_N": массив}"""
+    columns = {}
+    for factor in FACTORS:
+        columns[f"factor_{factor}"] = np.asarray([record[factor] for record in records])
+    return columns
+
+def _column_predicate(condition, column):
+    """Вычисляет условие сразу для всего столбца, при необходимости поэлементно"""
+    result = condition(column)
+    if isinstance(result, np.ndarray) and result.shape == column.shape:
+        return result.astype(bool)
+    return np.fromiter((condition(v) for v in column), dtype=bool, count=column.shape[0])
+
+def _has_fact(bits, fact):
+    """Булев столбец: выведен ли факт fact у каждой анкеты"""
+    return (bits[:, fact // 64] >> np.uint64(fact % 64)) & np.uint64(1) == 1
+
+def _set_fact(bits, fact, mask):
+    """Устанавливает факт fact в строках mask"""
+    bits[:, fact // 64] |= mask.astype(np.uint64) << np.uint64(fact % 64)
+
+def evaluate_batch(columns, network=None):
+    """
+    Прямая цепочка сразу для пакета анкет.
+    columns — {"factor_N": массив значений}; возвращает битовую матрицу фактов
+    (анкеты x слова по 64 факта). Одиночные условия считаются по столбцам целиком,
+    комбинации — проверкой маски посылок, до неподвижной точки.
+    """
+    if network is None:
+        network = RULE_NETWORK
+    n_records = len(next(iter(columns.values())))
+    bits = np.zeros((n_records, network["n_words"]), dtype=np.uint64)
+
+    combinations = list(network["combinations"])
+    for factor, condition, result in network["singles"]:
+        if factor in columns:
+            column = np.asarray(columns[factor])
+            _set_fact(bits, result, _column_predicate(condition, column))
+        elif factor in network["fact_ids"] and condition(True):
+            # Условие на выводимый факт работает как комбинация из одной посылки
+            mask = np.zeros(network["n_words"], dtype=np.uint64)
+            fact = network["fact_ids"][factor]
+            mask[fact // 64] = np.uint64(1) << np.uint64(fact % 64)
+            combinations.append((mask, result))
+
+    changed = True
+    while changed:
+        changed = False
+        for mask, result in combinations:
+            satisfied = ((bits & mask) == mask).all(axis=1)
+            new = satisfied & ~_has_fact(bits, result)
+            if new.any():
+                _set_fact(bits, result, new)
+                changed = True
+    return bits
+
+def fact_matrix(bits, network=None):
+    """Распаковывает битовую матрицу в булеву матрицу анкеты x факты (в порядке fact_ids)"""
+    if network is None:
+        network = RULE_NETWORK
+    unpacked = np.unpackbits(bits.view(np.uint8), axis=1, bitorder="little")
+    return unpacked[:, :len(network["fact_ids"])].astype(bool)
+
+def get_recommendations_batch(columns, network=None):
+    """
+    Рекомендации для пакета анкет: булева матрица анкеты x рекомендации
+    и список текстов рекомендаций (столбцы матрицы).
+    """
+    if network is None:
+        network = RULE_NETWORK
+    bits = evaluate_batch(columns, network)
+    matrix = np.stack([_has_fact(bits, source) for source, _ in network["recommendations"]], axis=1)
+    return matrix, [text for _, text in network["recommendations"]]
+
+def main(argv=None):
     """Основная функция программы"""
+    parser = argparse.ArgumentParser(description="Экспертная система планирования подготовки к экзаменам")
+    parser.add_argument("--backward", action="store_true",
+                        help="обратная цепочка: задавать только нужные для вывода вопросы")
+    args = parser.parse_args(argv)
+
     print("Добро пожаловать в экспертную систему планирования подготовки к экзаменам!")
     print("Пожалуйста, ответьте на следующие вопросы.\n")
     
-    # Сбор данных
-    raw_data = collect_data()
-    
-    # Преобразование данных в формат фактов
-    facts = {f"factor_{k}": v for k, v in raw_data.items()}
-    
-    # Применение правил прямой цепочки
-    updated_facts = apply_rules(facts)
-    
-    # Получение рекомендаций
-    recommendations = get_recommendations(updated_facts)
+    if args.backward:
+        # Вопросы задаются по мере необходимости
+        recommendations, _, stats = backward_chain()
+        print(f"\nЗадано вопросов: {stats['asked']}, пропущено ненужных: {stats['avoided']}")
+    else:
+        # Сбор данных
+        raw_data = collect_data()
+
+        # Преобразование данных в формат фактов
+        facts = {f"factor_{k}": v for k, v in raw_data.items()}
+
+        # Применение правил прямой цепочки
+        updated_facts = apply_rules(facts)
+
+        # Получение рекомендаций
+        recommendations = get_recommendations(updated_facts)
 
     # Вывод результата
     print("\nРекомендации:")
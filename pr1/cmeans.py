@@ -0,0 +1,88 @@
+"""
+Нечёткая кластеризация C-средних (Fuzzy C-Means) с той же сигнатурой и теми же
+результатами, что и skfuzzy.cluster.cmeans.
+
+Отличия:
+- axis — ось объектов: 1 для раскладки (признаки, объекты), как в skfuzzy,
+  0 для (объекты, признаки). Данные не копируются и не транспонируются:
+  оба случая сводятся к представлению (view) массива.
+- full_output=False — возвращаются только центры и матрица принадлежности,
+  без матрицы расстояний и истории целевой функции.
+- Евклидовы расстояния считаются через ||x||^2 - 2 x.c + ||c||^2 одним матричным
+  произведением на итерацию; другие метрики — через scipy.spatial.distance.cdist.
+"""
+import numpy as np
+
+EPS = np.finfo(np.float64).eps
+
+
+def squared_distances(X, centers, x_sq=None):
+    """Квадраты евклидовых расстояний: матрица кластеры x объекты. X — (объекты, признаки)."""
+    if x_sq is None:
+        x_sq = np.einsum('ij,ij->i', X, X)
+    c_sq = np.einsum('ij,ij->i', centers, centers)
+    d2 = centers @ X.T
+    d2 *= -2
+    d2 += c_sq[:, None]
+    d2 += x_sq[None, :]
+    return np.maximum(d2, 0, out=d2)
+
+
+def cmeans_step(X, u, m, metric='euclidean', x_sq=None):
+    """
+    Одна итерация FCM для X (объекты, признаки) и матрицы принадлежности u (кластеры, объекты).
+    Возвращает центры, новую матрицу принадлежности, значение целевой функции и расстояния.
+    """
+    u = np.fmax(u / u.sum(axis=0), EPS)
+    um = u ** m
+    centers = (um @ X) / um.sum(axis=1)[:, None]
+
+    if metric == 'euclidean':
+        d2 = np.fmax(squared_distances(X, centers, x_sq), EPS * EPS)
+    else:
+        from scipy.spatial.distance import cdist
+        d2 = np.fmax(cdist(X, centers, metric=metric).T, EPS) ** 2
+    jm = (um * d2).sum()
+
+    # u_ik ~ d_ik^(-2/(m-1)) = (d_ik^2)^(-1/(m-1)), нормировка по кластерам
+    u_new = 1 / d2 if m == 2 else d2 ** (-1 / (m - 1))
+    u_new /= u_new.sum(axis=0)
+    return centers, u_new, jm, d2
+
+
+def cmeans(data, c, m, error, maxiter, metric='euclidean', init=None, seed=None,
+           axis=1, full_output=True):
+    """
+    Кластеризация FCM, совместимая с skfuzzy.cluster.cmeans.
+    data — (признаки, объекты) при axis=1 или (объекты, признаки) при axis=0.
+    Возвращает (cntr, u, u0, d, jm, p, fpc), как skfuzzy, или (cntr, u) при full_output=False.
+    cntr — (c, признаки), u, u0, d — (c, объекты).
+    """
+    data = np.asarray(data, dtype=np.float64)
+    X = data.T if axis == 1 else data  # (объекты, признаки), без копии
+    n = X.shape[0]
+
+    if init is None:
+        if seed is not None:
+            np.random.seed(seed=seed)
+        init = np.random.rand(c, n)
+        init /= init.sum(axis=0)
+    u0 = init
+    u = np.fmax(u0, EPS)
+
+    x_sq = np.einsum('ij,ij->i', X, X) if metric == 'euclidean' else None
+    jm = []
+    p = 0
+    while p < maxiter:
+        u_old = u
+        cntr, u, step_jm, d2 = cmeans_step(X, u_old, m, metric, x_sq)
+        if full_output:
+            jm.append(step_jm)
+        p += 1
+        if np.linalg.norm(u - u_old) < error:
+            break
+
+    if not full_output:
+        return cntr, u
+    fpc = np.einsum('ij,ij->', u, u) / n
+    return cntr, u, u0, np.sqrt(d2), np.array(jm), p, fpc
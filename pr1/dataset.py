@@ -0,0 +1,112 @@
+"""
+Загрузка выборки pr1 с кэшем в двоичном формате.
+
+CSV разбирается один раз и сохраняется в .npy в раскладке признаки x объекты
+(как ждёт fuzz.cluster.cmeans), поэтому транспонирование и копия не нужны.
+При следующих запусках файл открывается через memmap. Кэш пересобирается,
+если исходный CSV изменился: по размеру и времени изменения (check='mtime')
+или по SHA-256 содержимого (check='hash'). CSV разбирается порциями по
+chunk_size строк прямо в memmap, поэтому файл может не помещаться в память.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+
+
+def file_signature(path, check='mtime'):
+    """Признак версии файла: размер и mtime или SHA-256 содержимого"""
+    stat = os.stat(path)
+    signature = {'size': stat.st_size}
+    if check == 'hash':
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        signature['sha256'] = digest.hexdigest()
+    elif check == 'mtime':
+        signature['mtime_ns'] = stat.st_mtime_ns
+    else:
+        raise ValueError(f"Неизвестный способ проверки кэша: {check}")
+    return signature
+
+
+def cache_paths(path, cache_dir=None):
+    """Пути к .npy и файлу описания кэша для CSV path"""
+    path = os.path.abspath(path)
+    cache_dir = cache_dir or os.path.join(os.path.dirname(path), '__pycache__')
+    stem = os.path.splitext(os.path.basename(path))[0]
+    key = hashlib.sha256(path.encode('utf-8')).hexdigest()[:12]
+    base = os.path.join(cache_dir, f"{stem}-{key}")
+    return base + '.npy', base + '.json'
+
+
+def count_rows(path):
+    """Количество строк данных в CSV (без заголовка), подсчёт по блокам"""
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def build_cache(path, npy_path, dtype=np.float64, chunk_size=100_000):
+    """
+    Разбирает CSV порциями и записывает столбцы в .npy формы (признаки, объекты).
+    Возвращает имена столбцов. Файл пишется во временный и переименовывается,
+    поэтому прерванная сборка не оставляет испорченный кэш.
+    """
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    rows = count_rows(path)
+    tmp_path = npy_path[:-len('.npy')] + '.tmp.npy'  # np.save дописывает .npy к другим именам
+    data = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=(len(columns), rows))
+    filled = 0
+    for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=dtype):
+        data[:, filled:filled + len(chunk)] = chunk.to_numpy().T
+        filled += len(chunk)
+    if filled != rows:
+        # Пустые строки в CSV: оставляем только разобранные
+        trimmed = np.array(data[:, :filled])
+        del data
+        np.save(tmp_path, trimmed)
+    else:
+        data.flush()
+        del data
+    os.replace(tmp_path, npy_path)
+    return columns
+
+
+def load_dataset(path, cache_dir=None, check='mtime', dtype=np.float64, chunk_size=100_000, mmap=True):
+    """
+    Выборка из CSV path как массив (признаки, объекты) и список имён столбцов.
+    При mmap=True массив открыт только для чтения через memmap.
+    """
+    npy_path, meta_path = cache_paths(path, cache_dir)
+    signature = file_signature(path, check)
+    dtype = np.dtype(dtype)
+
+    meta = None
+    if os.path.exists(npy_path) and os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if (meta.get('version') != CACHE_VERSION or meta.get('dtype') != dtype.str
+                or any(meta.get(k) != v for k, v in signature.items())):
+            meta = None
+
+    if meta is None:
+        os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+        columns = build_cache(path, npy_path, dtype, chunk_size)
+        meta = {'version': CACHE_VERSION, 'dtype': dtype.str, 'columns': columns, **signature}
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=4)
+
+    data = np.load(npy_path, mmap_mode='r' if mmap else None)
+    return data, meta['columns']
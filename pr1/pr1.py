@@ -1,26 +1,14 @@
-import pandas as pd
+import argparse
+import os
+
 import numpy as np
-import skfuzzy as fuzz
 import matplotlib.pyplot as plt
 
-# Загрузка выборки
-df = pd.read_csv("./pr1/generated_dataset.csv")
-X = df.iloc[:, :5].values.T  # (features, samples)
-
-# Кластеризация методом C-средних
-n_clusters = 3
-cntr, u, _, _, _, _, _ = fuzz.cluster.cmeans(
-    X, c=n_clusters, m=2, error=0.005, maxiter=1000, init=None)
+from cmeans import cmeans
+from dataset import load_dataset
 
-print("Центры кластеров:")
-print(cntr)
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_dataset.csv")
 
-# Подготовка данных по x1
-x1 = df["x1"].values
-centers_x1 = [c[0] for c in cntr]
-
-# Определение принадлежности каждой точки к кластеру (по максимуму в строке матрицы u)
-cluster_assignments = np.argmax(u, axis=0)
 
 # Функции принадлежности
 def gaussian_membership(x, c, sigma=0.1):
@@ -35,51 +23,108 @@ def triangular_membership(x, a, b, c):
 def trapezoidal_membership(x, a, b, c, d):
     return np.maximum(np.minimum(np.minimum((x - a)/(b - a), 1), (d - x)/(d - c)), 0)
 
-# Визуализация всех функций по x1
-fig, axs = plt.subplots(2, 2, figsize=(12, 10))
-axs = axs.flatten()
-
-# Цвета для кластеров
-colors = ['r', 'g', 'b']
-
-# 1. Гауссова
-for i in range(n_clusters):
-    mu = gaussian_membership(x1, centers_x1[i])
-    axs[0].scatter(x1, mu, color=colors[i], alpha=0.6, label=f'Кластер {i+1}', s=20)
-    axs[0].axvline(centers_x1[i], color=colors[i], linestyle='--', linewidth=1.5)
-axs[0].set_title("Гауссовы функции принадлежности (точки)")
-axs[0].legend()
-axs[0].grid(True)
-
-# 2. Обобщённая гауссова
-for i in range(n_clusters):
-    mu = generalized_gaussian_membership(x1, centers_x1[i])
-    axs[1].scatter(x1, mu, color=colors[i], alpha=0.6, label=f'Кластер {i+1}', s=20)
-    axs[1].axvline(centers_x1[i], color=colors[i], linestyle='--', linewidth=1.5)
-axs[1].set_title("Обобщённые гауссовы функции принадлежности (β=3) (точки)")
-axs[1].legend()
-axs[1].grid(True)
-
-# 3. Треугольная
-delta = 0.1
-for i in range(n_clusters):
-    a, b, c_ = centers_x1[i] - delta, centers_x1[i], centers_x1[i] + delta
-    mu = triangular_membership(x1, a, b, c_)
-    axs[2].scatter(x1, mu, color=colors[i], alpha=0.6, label=f'Кластер {i+1}', s=20)
-    axs[2].axvline(centers_x1[i], color=colors[i], linestyle='--', linewidth=1.5)
-axs[2].set_title("Треугольные функции принадлежности (точки)")
-axs[2].legend()
-axs[2].grid(True)
-
-# 4. Трапециевидная
-for i in range(n_clusters):
-    a, b, c_, d = centers_x1[i] - 0.15, centers_x1[i] - 0.05, centers_x1[i] + 0.05, centers_x1[i] + 0.15
-    mu = trapezoidal_membership(x1, a, b, c_, d)
-    axs[3].scatter(x1, mu, color=colors[i], alpha=0.6, label=f'Кластер {i+1}', s=20)
-    axs[3].axvline(centers_x1[i], color=colors[i], linestyle='--', linewidth=1.5)
-axs[3].set_title("Трапециевидные функции принадлежности (точки)")
-axs[3].legend()
-axs[3].grid(True)
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+
+def load_features(path=DATA_PATH, n_features=5, check='mtime'):
+    """Признаки выборки в раскладке (признаки, объекты) — через двоичный кэш dataset.py"""
+    data, columns = load_dataset(path, check=check)
+    return data[:n_features], columns[:n_features]
+
+
+# Семейства функций принадлежности с параметрами, как на графиках:
+# название -> (функция от x и центра c, заголовок графика)
+MEMBERSHIP_FAMILIES = {
+    'gaussian': (lambda x, c: gaussian_membership(x, c),
+                 "Гауссовы функции принадлежности (точки)"),
+    'generalized_gaussian': (lambda x, c: generalized_gaussian_membership(x, c),
+                             "Обобщённые гауссовы функции принадлежности (β=3) (точки)"),
+    'triangular': (lambda x, c: triangular_membership(x, c - 0.1, c, c + 0.1),
+                   "Треугольные функции принадлежности (точки)"),
+    'trapezoidal': (lambda x, c: trapezoidal_membership(x, c - 0.15, c - 0.05, c + 0.05, c + 0.15),
+                    "Трапециевидные функции принадлежности (точки)"),
+}
+
+
+def membership_tensor(X, centers, family='gaussian', axis=1, chunk_size=65536, dtype=np.float64):
+    """
+    Степени принадлежности всех объектов по всем признакам всем кластерам: тензор N x F x C.
+    X — (признаки, объекты) при axis=1 (как из load_features) или (объекты, признаки) при axis=0,
+    centers — (C, F). Значения считаются одним broadcast X[:, :, None] и centers.T[None]
+    для порций по chunk_size объектов; dtype=np.float32 — вычисление и результат в float32.
+    """
+    func = MEMBERSHIP_FAMILIES[family][0]
+    samples = X.T if axis == 1 else X
+    centers = np.asarray(centers, dtype=dtype).T[None]  # (1, F, C)
+    n = samples.shape[0]
+    result = np.empty((n, samples.shape[1], centers.shape[2]), dtype=dtype)
+    for start in range(0, n, chunk_size):
+        chunk = np.asarray(samples[start:start + chunk_size], dtype=dtype)
+        result[start:start + chunk_size] = func(chunk[:, :, None], centers)
+    return result
+
+
+def compute_memberships(X, centers, families=MEMBERSHIP_FAMILIES, **kwargs):
+    """Тензоры N x F x C для каждого семейства функций принадлежности"""
+    return {family: membership_tensor(X, centers, family, **kwargs) for family in families}
+
+
+def plot_memberships(x1, centers_x1, memberships):
+    """
+    Визуализация функций принадлежности по x1: memberships — семейство -> матрица N x C
+    (срез тензора membership_tensor по признаку x1).
+    """
+    fig, axs = plt.subplots(2, 2, figsize=(12, 10))
+    axs = axs.flatten()
+
+    # Цвета для кластеров
+    colors = ['r', 'g', 'b']
+
+    for ax, (family, mu) in zip(axs, memberships.items()):
+        for i, center in enumerate(centers_x1):
+            color = colors[i % len(colors)]
+            ax.scatter(x1, mu[:, i], color=color, alpha=0.6, label=f'Кластер {i+1}', s=20)
+            ax.axvline(center, color=color, linestyle='--', linewidth=1.5)
+        ax.set_title(MEMBERSHIP_FAMILIES[family][1])
+        ax.legend()
+        ax.grid(True)
+
+    plt.tight_layout()
+    plt.show()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Фаззификация выборки методом C-средних")
+    parser.add_argument("--data", default=DATA_PATH, help="CSV-файл выборки")
+    parser.add_argument("--clusters", type=int, default=3, help="количество кластеров")
+    parser.add_argument("--check", choices=["mtime", "hash"], default="mtime",
+                        help="проверка актуальности кэша: по времени изменения или по хэшу")
+    parser.add_argument("--float32", action="store_true", help="степени принадлежности в float32")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="объектов в порции при расчёте")
+    parser.add_argument("--save", help="сохранить тензоры N x F x C в .npz")
+    parser.add_argument("--no-plot", action="store_true", help="не показывать графики")
+    args = parser.parse_args(argv)
+
+    # Загрузка выборки
+    X, _ = load_features(args.data, check=args.check)
+
+    # Кластеризация методом C-средних
+    n_clusters = args.clusters
+    cntr, u = cmeans(X, c=n_clusters, m=2, error=0.005, maxiter=1000, init=None, full_output=False)
+
+    print("Центры кластеров:")
+    print(cntr)
+
+    # Определение принадлежности каждой точки к кластеру (по максимуму в строке матрицы u)
+    cluster_assignments = np.argmax(u, axis=0)
+
+    # Степени принадлежности по всем признакам и кластерам
+    memberships = compute_memberships(X, cntr, chunk_size=args.chunk_size,
+                                      dtype=np.float32 if args.float32 else np.float64)
+    if args.save:
+        np.savez(args.save, centers=cntr, assignments=cluster_assignments, **memberships)
+
+    if not args.no_plot:
+        plot_memberships(X[0], cntr[:, 0], {family: mu[:, 0, :] for family, mu in memberships.items()})
+
+
+if __name__ == "__main__":
+    main()